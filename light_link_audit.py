@@ -0,0 +1,456 @@
+"""Audit light linking in .blend files without starting Blender.
+
+Reads the .blend container directly: the file header, the SDNA struct
+catalogue and only the blocks light linking depends on (objects,
+collections, linked-ID placeholders and their data). Mesh data and every
+other block is skipped without being read.
+
+    python light_link_audit.py shots/ --jobs 8
+    python light_link_audit.py a.blend b.blend --json
+"""
+import argparse
+import gzip
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+LINKING_PREFIX = "Light Linking for "
+LEGACY_GROUP_PROP = "light_linking_receiver_collection"
+LINKING_TAG_PROP = "ll_linking_group"
+
+OB_LAMP = 10
+IDP_STRING = 0
+IDP_INT = 1
+IDP_GROUP = 6
+IDP_BOOLEAN = 10
+
+# ID blocks whose DATA blocks are indexed; everything else is stepped over.
+WANTED_CODES = {b"OB\0\0", b"GR\0\0", b"ID\0\0"}
+
+class BlendFormatError(Exception):
+    pass
+
+# -------------------------------------------------------------------
+#   File Container (header and block headers)
+# -------------------------------------------------------------------
+def open_blend(path):
+    with open(path, "rb") as f:
+        magic = f.read(4)
+        f.seek(0)
+        if magic[:2] == b"\x1f\x8b":
+            # Compressed files cannot be mapped; they are small enough to inflate.
+            return gzip.decompress(f.read())
+        if magic == b"\x28\xb5\x2f\xfd":
+            try:
+                import zstandard
+            except ImportError:
+                raise BlendFormatError("file is zstd-compressed; install the 'zstandard' package to read it")
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            return b"".join(iter(lambda: reader.read(1 << 24), b""))
+        if not magic:
+            raise BlendFormatError("empty file")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def parse_header(data):
+    if data[:7] != b"BLENDER":
+        raise BlendFormatError("not a .blend file")
+    if data[7:9].isdigit():
+        # Blender 5.0+: "BLENDER17-01v0500", 64-bit only, with wide block headers.
+        header_size = int(data[7:9])
+        endian = data[12:13]
+        version = data[13:17]
+        pointer_size = 8
+        wide = True
+    else:
+        header_size = 12
+        pointer_size = 8 if data[7:8] == b"-" else 4
+        endian = data[8:9]
+        version = data[9:12]
+        wide = False
+    if endian not in (b"v", b"V"):
+        raise BlendFormatError("unknown byte order")
+    version = int(version)
+    return header_size, "<" if endian == b"v" else ">", pointer_size, wide, f"{version // 100}.{version % 100}"
+
+# -------------------------------------------------------------------
+#   SDNA (struct layouts stored in the file)
+# -------------------------------------------------------------------
+FIELD_NAME = re.compile(r"[(*]*(\w+)")
+FIELD_DIMS = re.compile(r"\[(\d+)\]")
+
+class SDNA:
+    """Struct name -> {field name: (offset, size, is_pointer)} parsed from the DNA1 block."""
+
+    def __init__(self, data, start, order, pointer_size):
+        pos = start
+
+        def expect(tag):
+            nonlocal pos
+            if data[pos:pos + 4] != tag:
+                raise BlendFormatError(f"SDNA: expected {tag!r}")
+            pos += 4
+
+        def align():
+            nonlocal pos
+            pos = start + ((pos - start + 3) & ~3)
+
+        def strings():
+            nonlocal pos
+            count = struct.unpack_from(order + "i", data, pos)[0]
+            pos += 4
+            result = []
+            for _ in range(count):
+                end = data.find(b"\0", pos)
+                result.append(data[pos:end].decode("ascii", "replace"))
+                pos = end + 1
+            align()
+            return result
+
+        expect(b"SDNA")
+        expect(b"NAME")
+        names = strings()
+        expect(b"TYPE")
+        types = strings()
+        expect(b"TLEN")
+        lengths = struct.unpack_from(f"{order}{len(types)}H", data, pos)
+        pos += 2 * len(types)
+        align()
+        expect(b"STRC")
+        count = struct.unpack_from(order + "i", data, pos)[0]
+        pos += 4
+
+        self.structs = {}
+        for _ in range(count):
+            type_index, field_count = struct.unpack_from(order + "hh", data, pos)
+            pos += 4
+            fields = {}
+            offset = 0
+            for _ in range(field_count):
+                field_type, field_name = struct.unpack_from(order + "hh", data, pos)
+                pos += 4
+                name = names[field_name]
+                is_pointer = "*" in name
+                size = pointer_size if is_pointer else lengths[field_type]
+                for dim in FIELD_DIMS.findall(name):
+                    size *= int(dim)
+                fields[FIELD_NAME.match(name).group(1)] = (offset, size, is_pointer)
+                offset += size
+            self.structs[types[type_index]] = fields
+
+    def field(self, struct_name, field_name):
+        return self.structs.get(struct_name, {}).get(field_name)
+
+# -------------------------------------------------------------------
+#   Block Reader
+# -------------------------------------------------------------------
+class BlendFile:
+    def __init__(self, path):
+        self.path = path
+        self.data = open_blend(path)
+        header_size, order, pointer_size, wide, self.version = parse_header(self.data)
+        self.order = order
+        self.pointer = struct.Struct(order + ("Q" if pointer_size == 8 else "I"))
+        if wide:
+            # code, SDNA index, old pointer, length, count
+            bhead, fields = struct.Struct(order + "4siQqq"), (0, 3, 2)
+        elif pointer_size == 8:
+            bhead, fields = struct.Struct(order + "4siQii"), (0, 1, 2)
+        else:
+            bhead, fields = struct.Struct(order + "4siIii"), (0, 1, 2)
+        # Old pointer -> data offset, for wanted ID blocks and their DATA blocks.
+        self.blocks = {}
+        self.ids = []
+        self.sdna = None
+        self.scan(header_size, bhead, fields)
+        if self.sdna is None:
+            raise BlendFormatError("file has no SDNA block")
+
+    def scan(self, pos, bhead, fields):
+        data = self.data
+        size = len(data)
+        unpack = bhead.unpack_from
+        head_size = bhead.size
+        code_i, len_i, old_i = fields
+        blocks = self.blocks
+        owner = None
+        while pos + head_size <= size:
+            head = unpack(data, pos)
+            code, length, old = head[code_i], head[len_i], head[old_i]
+            start = pos + head_size
+            pos = start + length
+            if code == b"DATA":
+                if owner in WANTED_CODES:
+                    blocks[old] = start
+            elif code == b"ENDB":
+                break
+            elif code == b"DNA1":
+                self.sdna = SDNA(data, start, self.order, self.pointer.size)
+            else:
+                owner = code
+                if code in WANTED_CODES:
+                    blocks[old] = start
+                    self.ids.append((code, start, old))
+
+    def offset(self, struct_name, *path):
+        # Offset of a (nested) field, e.g. offset("IDProperty", "data", "val").
+        total = 0
+        for field_name in path:
+            field = self.sdna.field(struct_name, field_name)
+            if field is None:
+                return None
+            total += field[0]
+            struct_name = NESTED_TYPES.get((struct_name, field_name))
+        return total
+
+    def read_pointer(self, pos):
+        return self.pointer.unpack_from(self.data, pos)[0]
+
+    def read_int(self, pos, fmt="i"):
+        return struct.unpack_from(self.order + fmt, self.data, pos)[0]
+
+    def read_cstring(self, pos, size):
+        raw = self.data[pos:pos + size]
+        return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+    def id_name(self, pos):
+        field = self.sdna.field("ID", "name")
+        # Skip the two-letter ID code prefix ("OB", "GR", ...).
+        return self.read_cstring(pos + field[0], field[1])[2:]
+
+    def iter_list(self, first, struct_name):
+        next_offset = self.offset(struct_name, "next")
+        seen = set()
+        pointer = first
+        while pointer and pointer not in seen:
+            seen.add(pointer)
+            pos = self.blocks.get(pointer)
+            if pos is None:
+                return
+            yield pos
+            pointer = self.read_pointer(pos + next_offset)
+
+    def id_properties(self, pos):
+        # Top-level string/int/bool custom properties of an ID (user and system).
+        result = {}
+        for group_field in ("properties", "system_properties"):
+            field = self.offset("ID", group_field)
+            if field is None:
+                continue
+            group = self.blocks.get(self.read_pointer(pos + field))
+            if group is None or self.data[group + self.offset("IDProperty", "type")] != IDP_GROUP:
+                continue
+            first = self.read_pointer(group + self.offset("IDProperty", "data", "group", "first"))
+            for prop in self.iter_list(first, "IDProperty"):
+                result.setdefault(*self.read_id_property(prop))
+        return result
+
+    def read_id_property(self, pos):
+        name_field = self.sdna.field("IDProperty", "name")
+        name = self.read_cstring(pos + name_field[0], name_field[1])
+        prop_type = self.data[pos + self.offset("IDProperty", "type")]
+        if prop_type == IDP_STRING:
+            string = self.blocks.get(self.read_pointer(pos + self.offset("IDProperty", "data", "pointer")))
+            length = self.read_int(pos + self.offset("IDProperty", "len"))
+            return name, self.read_cstring(string, length) if string is not None else ""
+        if prop_type in (IDP_INT, IDP_BOOLEAN):
+            return name, self.read_int(pos + self.offset("IDProperty", "data", "val"))
+        return name, None
+
+# Struct types of the nested (non-pointer) fields walked by BlendFile.offset.
+NESTED_TYPES = {
+    ("Object", "id"): "ID",
+    ("Collection", "id"): "ID",
+    ("Collection", "gobject"): "ListBase",
+    ("Collection", "children"): "ListBase",
+    ("IDProperty", "data"): "IDPropertyData",
+    ("IDPropertyData", "group"): "ListBase",
+}
+
+# -------------------------------------------------------------------
+#   Light Link Extraction
+# -------------------------------------------------------------------
+def read_light_links(path):
+    """Return the light linking state of one .blend file as plain data."""
+    blend = BlendFile(path)
+    has_linking = blend.sdna.field("Object", "light_linking") is not None
+
+    names = {}
+    objects = []
+    collections = {}
+    # IDs linked from a library are only "ID" placeholders here; their members
+    # live in the library file.
+    placeholders = set()
+    gobject = blend.offset("Collection", "gobject", "first")
+    children = blend.offset("Collection", "children", "first")
+    for code, pos, old in blend.ids:
+        names[old] = blend.id_name(pos)
+        if code == b"OB\0\0":
+            objects.append(pos)
+        elif code == b"GR\0\0":
+            members = [
+                blend.read_pointer(item + blend.offset("CollectionObject", "ob"))
+                for item in blend.iter_list(blend.read_pointer(pos + gobject), "CollectionObject")
+            ]
+            nested = [
+                blend.read_pointer(item + blend.offset("CollectionChild", "collection"))
+                for item in blend.iter_list(blend.read_pointer(pos + children), "CollectionChild")
+            ]
+            collections[old] = (pos, members, nested)
+        else:
+            placeholders.add(old)
+
+    subtree_memo = {}
+
+    def subtree(coll, visiting=()):
+        # Object names of a collection and all its nested collections.
+        if coll in subtree_memo:
+            return subtree_memo[coll]
+        entry = collections.get(coll)
+        if entry is None or coll in visiting:
+            return frozenset()
+        result = {names[ob] for ob in entry[1] if ob in names}
+        for child in entry[2]:
+            result |= subtree(child, visiting + (coll,))
+        subtree_memo[coll] = frozenset(result)
+        return subtree_memo[coll]
+
+    type_offset = blend.offset("Object", "type")
+    linking_offset = blend.offset("Object", "light_linking") if has_linking else None
+    receiver_offset = blend.offset("LightLinking", "receiver_collection") if has_linking else None
+    blocker_offset = blend.offset("LightLinking", "blocker_collection") if has_linking else None
+
+    lights = {}
+    referenced = set()
+    for pos in objects:
+        receiver = blocker = 0
+        if linking_offset is not None:
+            linking = blend.blocks.get(blend.read_pointer(pos + linking_offset))
+            if linking is not None:
+                receiver = blend.read_pointer(linking + receiver_offset)
+                blocker = blend.read_pointer(linking + blocker_offset)
+        properties = blend.id_properties(pos)
+        legacy = properties.get(LEGACY_GROUP_PROP)
+        is_light = blend.read_int(pos + type_offset, "h") == OB_LAMP
+        if not (is_light or receiver or blocker or legacy):
+            continue
+        referenced.update((receiver, blocker))
+        lights[blend.id_name(pos)] = {
+            "is_light": is_light,
+            "receiver_collection": names.get(receiver),
+            "blocker_collection": names.get(blocker),
+            "receivers": sorted(subtree(receiver)) if receiver else [],
+            "blockers": sorted(subtree(blocker)) if blocker else [],
+            "legacy_group": legacy if isinstance(legacy, str) else None,
+            "library_collections": sorted(names[coll] for coll in (receiver, blocker) if coll in placeholders),
+        }
+
+    linking_collections = {}
+    for coll, (pos, members, nested) in collections.items():
+        name = names[coll]
+        tagged = bool(blend.id_properties(pos).get(LINKING_TAG_PROP))
+        if tagged or name.startswith(LINKING_PREFIX) or coll in referenced:
+            linking_collections[name] = {
+                "tagged": tagged,
+                "referenced": coll in referenced,
+                "objects": len(members),
+                "children": len(nested),
+            }
+
+    if isinstance(blend.data, mmap.mmap):
+        blend.data.close()
+    return {
+        "path": path,
+        "version": blend.version,
+        "lights": lights,
+        "linking_collections": linking_collections,
+    }
+
+def find_issues(result):
+    issues = []
+    collection_names = set(result["linking_collections"])
+    for name, info in sorted(result["linking_collections"].items()):
+        if not info["referenced"]:
+            issues.append(f"orphan linking collection '{name}'")
+    for light, info in sorted(result["lights"].items()):
+        library = info["library_collections"]
+        if info["receiver_collection"] and not info["receivers"] and info["receiver_collection"] not in library:
+            issues.append(f"'{light}' links to empty receiver collection '{info['receiver_collection']}'")
+        legacy = info["legacy_group"]
+        if legacy is not None:
+            state = "" if legacy in collection_names else ", collection missing"
+            issues.append(f"'{light}' still has the legacy link property -> '{legacy}'{state}")
+    return issues
+
+def find_library_links(result):
+    return [
+        f"'{light}' links to '{coll}' (linked from library, members not checked)"
+        for light, info in sorted(result["lights"].items())
+        for coll in info["library_collections"]
+    ]
+
+def audit_file(path):
+    try:
+        result = read_light_links(path)
+    except (OSError, BlendFormatError, struct.error, ValueError, IndexError, TypeError) as e:
+        return {"path": path, "error": str(e)}
+    result["issues"] = find_issues(result)
+    result["library_links"] = find_library_links(result)
+    return result
+
+# -------------------------------------------------------------------
+#   Command Line
+# -------------------------------------------------------------------
+def expand_paths(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".blend"))
+        else:
+            files.append(path)
+    return files
+
+def audit_paths(paths, jobs=None):
+    files = expand_paths(paths)
+    if len(files) <= 1 or jobs == 1:
+        return [audit_file(path) for path in files]
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(audit_file, files, chunksize=max(1, len(files) // (jobs * 4))))
+
+def format_result(result):
+    if "error" in result:
+        return f"{result['path']}: ERROR {result['error']}"
+    lights = result["lights"]
+    linked = sum(1 for info in lights.values() if info["receiver_collection"] or info["blocker_collection"])
+    lines = [
+        f"{result['path']}: Blender {result['version']}, {sum(info['is_light'] for info in lights.values())} light(s), "
+        f"{linked} linked, {len(result['linking_collections'])} linking collection(s), {len(result['issues'])} issue(s)"
+    ]
+    lines.extend(f"    {issue}" for issue in result["issues"])
+    lines.extend(f"    note: {link}" for link in result["library_links"])
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit light linking in .blend files without starting Blender.")
+    parser.add_argument("paths", nargs="+", help=".blend files or directories to search recursively")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="print the full results as JSON")
+    args = parser.parse_args(argv)
+
+    results = audit_paths(args.paths, args.jobs)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for result in results:
+            print(format_result(result))
+    return 1 if any("error" in result for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""Compare the light linking topology of two .blend files or exported link snapshots.
+
+    python light_link_diff.py shot_v012.blend shot_v013.blend
+    python light_link_diff.py before.llsnap after.llsnap --json
+
+.blend files are read with light_link_audit (no Blender needed); snapshots
+are the files written by the add-on's "Export Link Snapshot".
+"""
+import argparse
+import base64
+import json
+import sys
+import zlib
+
+from light_link_audit import BlendFormatError, read_light_links
+
+SNAPSHOT_VERSION = 4
+
+# Entry flags (same bits as the add-on's snapshot): parts that come from a
+# library file. Their contents are not in the .blend, so they are not compared.
+LIBRARY_LIGHT = 1
+LIBRARY_RECEIVERS = 2
+LIBRARY_BLOCKERS = 4
+
+# -------------------------------------------------------------------
+#   Loading Topologies ({light: (receivers, blockers, receiver coll, blocker coll, library flags)})
+# -------------------------------------------------------------------
+def load_blend(path):
+    topology = {}
+    for light, info in read_light_links(path)["lights"].items():
+        if info["receiver_collection"] or info["blocker_collection"]:
+            topology[light] = (
+                frozenset(info["receivers"]),
+                frozenset(info["blockers"]),
+                info["receiver_collection"] or "",
+                info["blocker_collection"] or "",
+                (LIBRARY_RECEIVERS if info["receiver_collection"] in info["library_collections"] else 0)
+                | (LIBRARY_BLOCKERS if info["blocker_collection"] in info["library_collections"] else 0),
+            )
+    return topology
+
+def load_snapshot(path):
+    with open(path, encoding="ascii") as f:
+        payload = json.loads(zlib.decompress(base64.b85decode(f.read().strip())))
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {payload.get('version')}")
+    names = payload["names"]
+    name = names.__getitem__
+    return {
+        names[light]: (
+            frozenset(map(name, receivers)),
+            frozenset(map(name, blockers)),
+            names[receiver_collection],
+            names[blocker_collection],
+            library,
+        )
+        for light, receivers, blockers, receiver_collection, blocker_collection, library in payload["rows"]
+    }
+
+def load_topology(path):
+    with open(path, "rb") as f:
+        magic = f.read(7)
+    # Compressed .blend files start with a gzip/zstd magic instead of "BLENDER".
+    if magic == b"BLENDER" or magic[:2] == b"\x1f\x8b" or magic[:4] == b"\x28\xb5\x2f\xfd":
+        return load_blend(path)
+    return load_snapshot(path)
+
+# -------------------------------------------------------------------
+#   Diff
+# -------------------------------------------------------------------
+def entry_digest(entry):
+    # frozenset hashes are computed once and cached on the set, so comparing
+    # digests first makes unchanged lights cost O(1) each.
+    return hash(entry)
+
+def diff_topologies(old, new):
+    old_digests = {light: entry_digest(entry) for light, entry in old.items()}
+    new_digests = {light: entry_digest(entry) for light, entry in new.items()}
+    # Lights linked in from a library only show up in snapshots; one missing on
+    # the other side is not a removal.
+    not_compared = sorted(
+        light for light in old.keys() ^ new.keys()
+        if (old.get(light) or new.get(light))[4] & LIBRARY_LIGHT
+    )
+    skipped = set(not_compared)
+    added = sorted(new.keys() - old.keys() - skipped)
+    removed = sorted(old.keys() - new.keys() - skipped)
+    changed = {}
+    for light in old.keys() & new.keys():
+        before, after = old[light], new[light]
+        # Equal digests are confirmed with == (set equality also exits early on differing hashes).
+        if old_digests[light] == new_digests[light] and before == after:
+            continue
+        library = before[4] | after[4]
+        change = {}
+        for index, kind, flag in ((0, "receivers", LIBRARY_RECEIVERS), (1, "blockers", LIBRARY_BLOCKERS)):
+            if library & flag:
+                continue
+            gained, lost = after[index] - before[index], before[index] - after[index]
+            if gained or lost:
+                change[kind] = {"added": sorted(gained), "removed": sorted(lost)}
+        for index, kind in ((2, "receiver_collection"), (3, "blocker_collection")):
+            if before[index] != after[index]:
+                change[kind] = {"old": before[index], "new": after[index]}
+        if change:
+            changed[light] = change
+    return {
+        "added": {light: entry_summary(new[light]) for light in added},
+        "removed": {light: entry_summary(old[light]) for light in removed},
+        "changed": dict(sorted(changed.items())),
+        "unchanged": len(old.keys() & new.keys()) - len(changed),
+        "not_compared": not_compared,
+    }
+
+def entry_summary(entry):
+    return {
+        "receivers": len(entry[0]),
+        "blockers": len(entry[1]),
+        "receiver_collection": entry[2],
+        "blocker_collection": entry[3],
+    }
+
+def format_names(names, limit=8):
+    shown = ", ".join(names[:limit])
+    return shown + (f", ... (+{len(names) - limit})" if len(names) > limit else "")
+
+def format_diff(diff):
+    lines = [
+        f"{len(diff['added'])} light(s) newly linked, {len(diff['removed'])} unlinked, "
+        f"{len(diff['changed'])} changed, {diff['unchanged']} unchanged"
+    ]
+    if diff["not_compared"]:
+        lines.append(f"  {len(diff['not_compared'])} library light(s) not compared: {format_names(diff['not_compared'])}")
+    for light, info in diff["added"].items():
+        lines.append(f"+ {light}: {info['receivers']} receiver(s), {info['blockers']} blocker(s)")
+    for light, info in diff["removed"].items():
+        lines.append(f"- {light}: had {info['receivers']} receiver(s), {info['blockers']} blocker(s)")
+    for light, change in diff["changed"].items():
+        lines.append(f"~ {light}")
+        for kind in ("receivers", "blockers"):
+            if kind in change:
+                if change[kind]["added"]:
+                    lines.append(f"    {kind} +{len(change[kind]['added'])}: {format_names(change[kind]['added'])}")
+                if change[kind]["removed"]:
+                    lines.append(f"    {kind} -{len(change[kind]['removed'])}: {format_names(change[kind]['removed'])}")
+        for kind in ("receiver_collection", "blocker_collection"):
+            if kind in change:
+                lines.append(f"    {kind}: '{change[kind]['old']}' -> '{change[kind]['new']}'")
+    return "\n".join(lines)
+
+# -------------------------------------------------------------------
+#   Command Line
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what changed in light linking between two files.")
+    parser.add_argument("old", help="earlier .blend file or link snapshot")
+    parser.add_argument("new", help="later .blend file or link snapshot")
+    parser.add_argument("--json", action="store_true", help="print the diff as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        old, new = load_topology(args.old), load_topology(args.new)
+    except (OSError, BlendFormatError, ValueError, KeyError, IndexError, zlib.error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    diff = diff_topologies(old, new)
+    if args.json:
+        json.dump(diff, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_diff(diff))
+    return 1 if diff["added"] or diff["removed"] or diff["changed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -2,90 +2,1071 @@ bl_info = {
     "name": "Light Link (Multi-Select Custom Lists with Clear Filter, Scroll & Light Linking)",
     "author": "Your Name",
     "version": (1, 6),
-    "blender": (3, 0, 0),
+    "blender": (4, 0, 0),
     "description": (
         "For the first selected light, create a new light linking receiver collection "
-        "(using bpy.ops.object.light_linking_receiver_collection_new) and add the selected "
+        "and add the selected "
         "meshes (including those from selected collections) to it using bpy.ops.object.light_linking_add. "
-        "Then assign that linking group to all selected lights by storing its name in a custom property. "
+        "The linking group is tracked through each light's native receiver collection pointer, "
+        "so renaming the collection does not break the link. "
         "Also provides clear buttons for filter fields and always shows a scrollable list."
     ),
     "category": "Object",
 }
 
+import os
+import base64
+import hashlib
+import json
+import zlib
+import heapq
+import time
 import bpy
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, deque, namedtuple
+from bpy.app.handlers import persistent
+
+# Custom property used by earlier versions to store the linking group's name.
+LEGACY_GROUP_PROP = "light_linking_receiver_collection"
 
 # -------------------------------------------------------------------
-#   Property Groups for List Items (with multi-selection support)
+#   Property Groups for List Items (pointer only; name and tick derived)
 # -------------------------------------------------------------------
 class LL_LightItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty()
     obj: bpy.props.PointerProperty(type=bpy.types.Object)
-    selected: bpy.props.BoolProperty(default=False)
 
 class LL_MeshItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty()
     obj: bpy.props.PointerProperty(type=bpy.types.Object)
-    selected: bpy.props.BoolProperty(default=False)
 
 class LL_CollectionItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty()
     coll: bpy.props.PointerProperty(type=bpy.types.Collection)
-    selected: bpy.props.BoolProperty(default=False)
+
+# -------------------------------------------------------------------
+#   Packed Row Selection (one bit per list row)
+# -------------------------------------------------------------------
+# Ticks live in one bitset per list, stored on the scene as a compressed
+# string so they are saved and undone with the file. Rows are only ever
+# appended or rebuilt as a whole, so a row index is a stable bit position.
+SELECTION_PROPS = {
+    "ll_light_items": "ll_light_selection",
+    "ll_mesh_items": "ll_mesh_selection",
+    "ll_collection_items": "ll_collection_selection",
+}
+LIST_POINTERS = {"ll_light_items": "obj", "ll_mesh_items": "obj", "ll_collection_items": "coll"}
+
+# (scene name, items property) -> (encoded string, bits) of the last decode.
+_selection_bits = {}
+
+def encode_selection(bits):
+    if not any(bits):
+        return ""
+    return base64.b85encode(zlib.compress(bytes(bits), 1)).decode("ascii")
+
+def decode_selection(text):
+    if not text:
+        return bytearray()
+    try:
+        return bytearray(zlib.decompress(base64.b85decode(text)))
+    except (ValueError, zlib.error):
+        return bytearray()
+
+def get_selection_bits(scene, items_prop):
+    # Re-decoded only when the stored string changed, e.g. after undo.
+    text = getattr(scene, SELECTION_PROPS[items_prop])
+    key = (scene.name, items_prop)
+    cached = _selection_bits.get(key)
+    if cached is None or cached[0] != text:
+        cached = _selection_bits[key] = (text, decode_selection(text))
+    return cached[1]
+
+def store_selection_bits(scene, items_prop, bits):
+    text = encode_selection(bits)
+    _selection_bits[(scene.name, items_prop)] = (text, bits)
+    setattr(scene, SELECTION_PROPS[items_prop], text)
+    mark_matrix_dirty()
+
+def is_row_selected(bits, row):
+    byte = row >> 3
+    return byte < len(bits) and bool(bits[byte] >> (row & 7) & 1)
+
+def set_row_bit(bits, row, value):
+    byte = row >> 3
+    if byte >= len(bits):
+        if not value:
+            return
+        bits.extend(bytes(byte + 1 - len(bits)))
+    if value:
+        bits[byte] |= 1 << (row & 7)
+    else:
+        bits[byte] &= ~(1 << (row & 7)) & 0xFF
+
+def selected_rows(bits):
+    for byte_index, byte in enumerate(bits):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield (byte_index << 3) | bit
+
+def all_rows_bits(count):
+    bits = bytearray(b"\xff" * (count >> 3))
+    if count & 7:
+        bits.append((1 << (count & 7)) - 1)
+    return bits
+
+def ticked_ids(scene, items_prop):
+    items = getattr(scene, items_prop)
+    pointer_prop = LIST_POINTERS[items_prop]
+    count = len(items)
+    result = []
+    for row in selected_rows(get_selection_bits(scene, items_prop)):
+        if row >= count:
+            break
+        id_data = getattr(items[row], pointer_prop)
+        if id_data:
+            result.append(id_data)
+    return result
+
+def listed_ids(scene, items_prop):
+    pointer_prop = LIST_POINTERS[items_prop]
+    return [id_data for id_data in (getattr(item, pointer_prop) for item in getattr(scene, items_prop)) if id_data]
+
+def replace_selection(scene, items_prop, bits):
+    old = get_selection_bits(scene, items_prop)
+    size = max(len(old), len(bits))
+    changed = bytearray(a ^ b for a, b in zip(old + bytes(size - len(old)), bits + bytes(size - len(bits))))
+    store_selection_bits(scene, items_prop, bits)
+    if any(changed):
+        push_selection_to_viewport(scene, items_prop, changed, bits)
+
+def set_row_selected(scene, items_prop, row, value):
+    bits = bytearray(get_selection_bits(scene, items_prop))
+    set_row_bit(bits, row, value)
+    replace_selection(scene, items_prop, bits)
+
+def migrate_row_selection():
+    # Rows saved before the bitset existed carry their own "name"/"selected" properties.
+    for scene in bpy.data.scenes:
+        for items_prop in SELECTION_PROPS:
+            items = getattr(scene, items_prop)
+            if not items or "selected" not in items[0]:
+                continue
+            bits = bytearray()
+            for row, item in enumerate(items):
+                set_row_bit(bits, row, bool(item.get("selected", False)))
+                for key in ("selected", "name"):
+                    if key in item:
+                        del item[key]
+            store_selection_bits(scene, items_prop, bits)
+
+# -------------------------------------------------------------------
+#   Property Groups for Named Light Groups
+# -------------------------------------------------------------------
+class LL_LightGroupMember(bpy.types.PropertyGroup):
+    obj: bpy.props.PointerProperty(type=bpy.types.Object)
+
+class LL_LightGroup(bpy.types.PropertyGroup):
+    name: bpy.props.StringProperty()
+    lights: bpy.props.CollectionProperty(type=LL_LightGroupMember)
+    receiver_collection: bpy.props.PointerProperty(type=bpy.types.Collection)
+
+# -------------------------------------------------------------------
+#   Linked and Library-Overridden Data
+# -------------------------------------------------------------------
+def id_edit_state(id_data):
+    if id_data.library is not None:
+        return 'LINKED'
+    override = id_data.override_library
+    if override is not None and override.is_system_override:
+        return 'SYSTEM_OVERRIDE'
+    return 'EDITABLE'
+
+def make_lights_editable(context, lights):
+    # Returns (editable lights, [(name, reason)]). Linked lights get their library
+    # overrides from a single make_override_library call instead of one per light.
+    editable, failures, linked = [], [], []
+    for light in lights:
+        state = id_edit_state(light)
+        if state == 'LINKED':
+            linked.append(light)
+            continue
+        if state == 'SYSTEM_OVERRIDE':
+            light.override_library.is_system_override = False
+        editable.append(light)
+    if not linked:
+        return editable, failures
+
+    # make_override_library works on the selection: keep the user's selection (and
+    # the list ticks synced to it) intact around the call.
+    view_layer = context.view_layer
+    previous_selection = list(view_layer.objects.selected)
+    previous_active = view_layer.objects.active
+    _selection_sync.applying = True
+    try:
+        selectable = override_linked_lights(view_layer, linked, failures)
+    finally:
+        restore_selection(view_layer, previous_selection, previous_active)
+        _selection_sync.applying = False
+    if not selectable:
+        return editable, failures
+
+    overrides = {
+        obj.override_library.reference: obj for obj in bpy.data.objects
+        if obj.override_library is not None and obj.override_library.reference is not None
+    }
+    for light in selectable:
+        override = overrides.get(light)
+        if override is None:
+            failures.append((light.name, "no library override was created"))
+            continue
+        if override.override_library.is_system_override:
+            override.override_library.is_system_override = False
+        editable.append(override)
+    # Point list rows at the new overrides; the linked originals left the scene.
+    for item in context.scene.ll_light_items:
+        if item.obj in overrides:
+            item.obj = overrides[item.obj]
+    invalidate_scope_indexes()
+    return editable, failures
+
+def override_linked_lights(view_layer, linked, failures):
+    bpy.ops.object.select_all(action='DESELECT')
+    selectable = []
+    for light in linked:
+        try:
+            light.select_set(True)
+            selectable.append(light)
+        except RuntimeError:
+            failures.append((light.name, "linked light is not in the active view layer"))
+    if not selectable:
+        return []
+    view_layer.objects.active = selectable[0]
+    try:
+        bpy.ops.object.make_override_library()
+    except RuntimeError as e:
+        failures.extend((light.name, f"could not create library override: {e}") for light in selectable)
+        return []
+    return selectable
+
+def restore_selection(view_layer, selection, active):
+    for obj in view_layer.objects.selected:
+        obj.select_set(False)
+    for obj in selection:
+        try:
+            obj.select_set(True)
+        except (RuntimeError, ReferenceError):
+            continue  # Replaced by its override or no longer in the view layer.
+    try:
+        view_layer.objects.active = active
+    except (RuntimeError, ReferenceError):
+        pass
+
+def report_link_failures(operator, failures):
+    if not failures:
+        return
+    for name, reason in failures:
+        print(f"Light Link: {name}: {reason}")
+    name, reason = failures[0]
+    operator.report({'WARNING'}, f"{len(failures)} link(s) could not be made, e.g. {name}: {reason} (see console)")
+
+# -------------------------------------------------------------------
+#   Scoped Object Index (active view layer, scene or all scenes)
+# -------------------------------------------------------------------
+class ScopeIndex:
+    __slots__ = ("objects", "lights", "meshes", "mesh_set", "collections", "_children")
+
+    def __init__(self, objects, collections):
+        self.objects = tuple(objects)
+        self.lights = tuple(obj for obj in self.objects if obj.type == 'LIGHT')
+        self.meshes = tuple(obj for obj in self.objects if obj.type == 'MESH')
+        self.mesh_set = frozenset(self.meshes)
+        self.collections = tuple(collections)
+        self._children = None
+
+    def children_map(self):
+        # Object.children scans all objects on every call; build parent -> children once.
+        if self._children is None:
+            self._children = {}
+            for obj in self.objects:
+                if obj.parent is not None:
+                    self._children.setdefault(obj.parent, []).append(obj)
+        return self._children
+
+    def session_uids(self):
+        return tuple(
+            tuple(id_data.session_uid for id_data in ids)
+            for ids in (self.objects, self.lights, self.meshes, self.collections)
+        )
+
+    @classmethod
+    def from_session_uids(cls, uids, resolve):
+        # Rebuild from uids captured before an undo step without rescanning the scene.
+        index = cls.__new__(cls)
+        index.objects, index.lights, index.meshes, index.collections = (
+            tuple(resolve[uid] for uid in group) for group in uids
+        )
+        index.mesh_set = frozenset(index.meshes)
+        index._children = None
+        return index
+
+# One index per scope key, so switching view layers or scenes reuses earlier scans.
+_scope_indexes = {}
+# Scope key -> scope_signature() the index was built with.
+_scope_signatures = {}
+
+def get_scope_view_layer(scene, context):
+    view_layer = getattr(context, "view_layer", None)
+    if view_layer is None or context.scene != scene:
+        view_layer = scene.view_layers[0]
+    return view_layer
+
+def enabled_layer_collections(view_layer):
+    # Depth-first walk that skips excluded layer collections and everything below them.
+    result = []
+    stack = list(reversed(view_layer.layer_collection.children))
+    while stack:
+        layer_coll = stack.pop()
+        if layer_coll.exclude:
+            continue
+        result.append(layer_coll.collection)
+        stack.extend(reversed(layer_coll.children))
+    return result
+
+def scope_signature(scope, scene, view_layer):
+    # Cheap check for changes that send no collection update: excluding a layer
+    # collection only tags the scene, and objects can be linked straight into it.
+    if scope == 'VIEW_LAYER':
+        excludes = []
+        stack = list(view_layer.layer_collection.children)
+        while stack:
+            layer_coll = stack.pop()
+            excludes.append(layer_coll.exclude)
+            stack.extend(layer_coll.children)
+        return len(view_layer.objects), tuple(excludes)
+    if scope == 'SCENE':
+        return len(scene.objects)
+    return tuple(len(sc.objects) for sc in bpy.data.scenes)
+
+def get_scope_index(scene, context):
+    scope = scene.ll_scope
+    view_layer = get_scope_view_layer(scene, context)
+    if scope == 'VIEW_LAYER':
+        key = (scope, scene.name, view_layer.name)
+    elif scope == 'SCENE':
+        key = (scope, scene.name)
+    else:
+        key = (scope,)
+    signature = scope_signature(scope, scene, view_layer)
+    index = _scope_indexes.get(key)
+    if index is None or _scope_signatures.get(key) != signature:
+        if scope == 'VIEW_LAYER':
+            # view_layer.objects already leaves out objects of excluded collections.
+            index = ScopeIndex(view_layer.objects, enabled_layer_collections(view_layer))
+        elif scope == 'SCENE':
+            index = ScopeIndex(scene.objects, bpy.data.collections)
+        else:
+            objects = dict.fromkeys(obj for sc in bpy.data.scenes for obj in sc.objects)
+            index = ScopeIndex(objects, bpy.data.collections)
+        _scope_indexes[key] = index
+        _scope_signatures[key] = signature
+    return index
+
+def invalidate_scope_indexes():
+    _scope_indexes.clear()
+    _scope_signatures.clear()
+    _subtree_memo.clear()
+
+# -------------------------------------------------------------------
+#   Receiver Expansion (memoized collection-tree walk)
+# -------------------------------------------------------------------
+# Collection -> (objects of the whole subtree, descendant collections).
+# Cleared together with the scope indexes whenever collections change.
+_subtree_memo = {}
+
+def collection_subtree(coll):
+    memo = _subtree_memo
+    if coll in memo:
+        return memo[coll]
+    # Iterative post-order walk; subtrees shared between parents are only walked once.
+    stack = [(coll, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if node in memo:
+            continue
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children if child not in memo)
+            continue
+        objects = set(node.objects)
+        descendants = set()
+        for child in node.children:
+            child_objects, child_descendants = memo[child]
+            objects |= child_objects
+            descendants.add(child)
+            descendants |= child_descendants
+        memo[node] = (frozenset(objects), frozenset(descendants))
+    return memo[coll]
+
+def expand_collections(collections):
+    # Collections nested inside another ticked collection are already covered by it.
+    collections = set(collections)
+    covered = set()
+    for coll in collections:
+        covered |= collection_subtree(coll)[1]
+    objects = set()
+    for coll in collections - covered:
+        objects |= collection_subtree(coll)[0]
+    return objects
+
+def expand_children(scope_index, roots):
+    children = scope_index.children_map()
+    result = set()
+    stack = list(roots)
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            if child not in result:
+                result.add(child)
+                stack.append(child)
+    return result
+
+# -------------------------------------------------------------------
+#   Emissive Mesh Sources (cached material scan)
+# -------------------------------------------------------------------
+class EmissionCache:
+    """Node tree session_uid -> whether it emits light, kept until the material or group is edited."""
+
+    def __init__(self):
+        self.trees = {}
+        # Bumped whenever results may have changed, so scans built on it can be reused.
+        self.generation = 0
+        # (scope index, generation, lights + emitters) of the last emitter scan.
+        self.sources = None
+
+    def clear(self):
+        self.trees.clear()
+        self.generation += 1
+        self.sources = None
+
+    def tree_emits(self, tree):
+        uid = tree.session_uid
+        emits = self.trees.get(uid)
+        if emits is None:
+            emits = self.trees[uid] = self.scan_tree(tree)
+        return emits
+
+    def scan_tree(self, tree):
+        # Only nodes that feed an output count; a stray Emission node does not light anything.
+        upstream = {}
+        for link in tree.links:
+            if not link.is_muted:
+                upstream.setdefault(link.to_node, []).append(link.from_node)
+        outputs = [node for node in tree.nodes if node.type in {'OUTPUT_MATERIAL', 'GROUP_OUTPUT'}]
+        active = [node for node in outputs if getattr(node, "is_active_output", False)]
+        stack = active or outputs
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            if not node.mute and self.node_emits(node):
+                return True
+            for from_node in upstream.get(node, ()):
+                if from_node not in seen:
+                    seen.add(from_node)
+                    stack.append(from_node)
+        return False
+
+    def node_emits(self, node):
+        if node.type == 'EMISSION':
+            return socket_nonzero(node.inputs.get("Strength")) and socket_nonzero(node.inputs.get("Color"))
+        if node.type == 'BSDF_PRINCIPLED':
+            # "Emission Color" since 4.0, "Emission" before.
+            color = node.inputs.get("Emission Color") or node.inputs.get("Emission")
+            return socket_nonzero(node.inputs.get("Emission Strength")) and socket_nonzero(color)
+        if node.type == 'GROUP' and node.node_tree is not None:
+            return self.tree_emits(node.node_tree)
+        return False
+
+    def material_emits(self, material):
+        if material is None or material.node_tree is None or not getattr(material, "use_nodes", True):
+            return False
+        return self.tree_emits(material.node_tree)
+
+    def object_emits(self, obj):
+        return any(self.material_emits(slot.material) for slot in obj.material_slots)
+
+    def invalidate(self, depsgraph):
+        for update in depsgraph.updates:
+            id_data = update.id.original
+            if isinstance(id_data, bpy.types.Material):
+                if id_data.node_tree is not None and self.trees.pop(id_data.node_tree.session_uid, None) is not None:
+                    self.generation += 1
+            elif isinstance(id_data, bpy.types.NodeTree):
+                # A node group may sit inside any number of materials.
+                self.clear()
+                return
+
+_emission_cache = EmissionCache()
+
+def socket_nonzero(socket):
+    if socket is None:
+        return False
+    if socket.is_linked:
+        return True
+    value = socket.default_value
+    if isinstance(value, float):
+        return value > 0.0
+    return any(channel > 0.0 for channel in value[:3])
+
+def is_light_source(scene, obj):
+    if obj.type == 'LIGHT':
+        return True
+    return scene.ll_include_emitters and obj.type == 'MESH' and _emission_cache.object_emits(obj)
+
+def emitter_scan_steps(meshes):
+    emitters = []
+    object_emits = _emission_cache.object_emits
+    for start in range(0, len(meshes), LIST_CHUNK):
+        emitters.extend(obj for obj in meshes[start:start + LIST_CHUNK] if object_emits(obj))
+        yield f"Scanning materials {min(start + LIST_CHUNK, len(meshes))} / {len(meshes)}"
+    return tuple(emitters)
+
+def get_light_sources(scene, scope_index):
+    # Lights plus emissive meshes, as listed by light_source_steps; reuses its last scan.
+    if not scene.ll_include_emitters:
+        return scope_index.lights
+    cached = _emission_cache.sources
+    if cached is None or cached[0] is not scope_index or cached[1] != _emission_cache.generation:
+        generation = _emission_cache.generation
+        sources = scope_index.lights + run_steps(emitter_scan_steps(scope_index.meshes))
+        cached = _emission_cache.sources = (scope_index, generation, sources)
+    return cached[2]
+
+def membership_changed(depsgraph):
+    if depsgraph.id_type_updated('COLLECTION'):
+        # Receiver/blocker collections the add-on created sit outside every scene,
+        # so linking into them (Link, Unlink, matrix Apply) leaves the scopes as they are.
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Collection) and not is_linking_collection(update.id.original):
+                return True
+    # Selection changes and add-on property writes also tag the scene; only a
+    # relations/geometry update means objects were added, removed or excluded.
+    if depsgraph.id_type_updated('SCENE'):
+        return any(isinstance(update.id, bpy.types.Scene) and update.is_updated_geometry for update in depsgraph.updates)
+    return False
+
+@persistent
+def ll_depsgraph_update_post(scene, depsgraph):
+    if membership_changed(depsgraph):
+        invalidate_scope_indexes()
+    # Links edited in the Outliner or Blender's own panel can keep every count
+    # link_fingerprint looks at, e.g. unlinking one receiver and linking another.
+    if depsgraph.id_type_updated('COLLECTION'):
+        links_changed()
+    if _emission_cache.trees and (depsgraph.id_type_updated('MATERIAL') or depsgraph.id_type_updated('NODETREE')):
+        _emission_cache.invalidate(depsgraph)
+    if scene.ll_sync_selection:
+        schedule_selection_sync()
+
+def update_include_emitters(scene, context):
+    submit_job(("refresh", scene.name, 'LIGHTS'), "Listing lights", iter_update_light_items(scene, context))
+
+def update_scope(scene, context):
+    submit_job(("refresh", scene.name, 'LIGHTS'), "Listing lights", iter_update_light_items(scene, context))
+    submit_job(("refresh", scene.name, 'MESHES'), "Listing meshes", iter_update_mesh_items(scene, context))
+    submit_job(("refresh", scene.name, 'COLLECTIONS'), "Listing collections", iter_update_collection_items(scene, context))
+
+# -------------------------------------------------------------------
+#   Time-Sliced Job Scheduler (bpy.app.timers)
+# -------------------------------------------------------------------
+JOB_TICK_BUDGET = 0.008
+JOB_TICK_INTERVAL = 0.01
+
+class Job:
+    __slots__ = ("key", "label", "steps", "started", "progress")
+
+    def __init__(self, key, label, steps):
+        self.key = key
+        self.label = label
+        self.steps = steps
+        self.started = False
+        self.progress = ""
+
+class JobScheduler:
+    """FIFO of generator-based jobs; each timer tick advances them until its time budget is spent."""
+
+    def __init__(self):
+        self.queue = deque()
+        self.last_message = ""
+
+    def submit(self, key, label, steps):
+        # A request for a job still waiting in the queue replaces its steps: they
+        # were set up from the settings of the time, the newest ones win.
+        for job in self.queue:
+            if job.key == key and not job.started:
+                job.steps.close()
+                job.steps = steps
+                return job
+        job = Job(key, label, steps)
+        self.queue.append(job)
+        if not bpy.app.timers.is_registered(run_scheduled_jobs):
+            bpy.app.timers.register(run_scheduled_jobs, first_interval=0.0)
+        return job
+
+    def tick(self):
+        deadline = time.perf_counter() + JOB_TICK_BUDGET
+        while self.queue and time.perf_counter() < deadline:
+            job = self.queue[0]
+            job.started = True
+            try:
+                job.progress = next(job.steps) or ""
+            except StopIteration as done:
+                self.queue.popleft()
+                self.last_message = done.value or f"{job.label}: done"
+            except Exception as e:
+                self.queue.popleft()
+                self.last_message = f"{job.label} failed: {str(e)}"
+                print(f"Light Link: {self.last_message}")
+        request_redraw()
+        return JOB_TICK_INTERVAL if self.queue else None
+
+    def cancel_all(self):
+        for job in self.queue:
+            job.steps.close()
+        self.queue.clear()
+        self.last_message = "Cancelled"
+
+_scheduler = JobScheduler()
+
+def run_scheduled_jobs():
+    return _scheduler.tick()
+
+def submit_job(key, label, steps):
+    return _scheduler.submit(key, label, steps)
+
+def run_steps(steps):
+    # Run a job synchronously and return its final message.
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def list_refresh_pending(scene):
+    return any(job.key[0] == "refresh" and job.key[1] == scene.name for job in _scheduler.queue)
+
+class ListsReadyPoll:
+    # For operators that read the list ticks: a refresh job leaves them partial until it ends.
+    @classmethod
+    def poll(cls, context):
+        if context.scene is None:
+            return False
+        if list_refresh_pending(context.scene):
+            cls.poll_message_set("Wait for the lists to finish refreshing")
+            return False
+        return True
+
+class LL_OT_CancelJobs(bpy.types.Operator):
+    bl_idname = "light_link.cancel_jobs"
+    bl_label = "Cancel Background Jobs"
+    bl_description = "Stop all queued and running Light Link background jobs"
+
+    def execute(self, context):
+        _scheduler.cancel_all()
+        request_redraw()
+        return {'FINISHED'}
 
 # -------------------------------------------------------------------
 #   Update Functions for Full List Population
 # -------------------------------------------------------------------
+LIST_CHUNK = 2000
+
+def fill_list_steps(scene, items_prop, index_prop, pointer_prop, sources, message):
+    items = getattr(scene, items_prop)
+    prev_sel = set(ticked_ids(scene, items_prop))
+    items.clear()
+    store_selection_bits(scene, items_prop, bytearray())
+    bits = bytearray()
+    try:
+        for start in range(0, len(sources), LIST_CHUNK):
+            for id_data in sources[start:start + LIST_CHUNK]:
+                setattr(items.add(), pointer_prop, id_data)
+                if id_data in prev_sel:
+                    set_row_bit(bits, len(items) - 1, True)
+            yield f"{len(items)} / {len(sources)}"
+    finally:
+        # Also when cancelled: the rows listed so far keep their ticks.
+        setattr(scene, index_prop, 0 if items else -1)
+        store_selection_bits(scene, items_prop, bits)
+    # Only the count: printing every name would block as long as the job itself.
+    print(message, len(items))
+    return f"Listed {len(items)} item(s)"
+
+def iter_update_light_items(scene, context):
+    scope_index = get_scope_index(scene, context)
+    if not scene.ll_include_emitters:
+        return fill_list_steps(scene, "ll_light_items", "ll_light_index", "obj", scope_index.lights, "Updated Light Items:")
+    return light_source_steps(scene, scope_index)
+
+def light_source_steps(scene, scope_index):
+    generation = _emission_cache.generation
+    emitters = yield from emitter_scan_steps(scope_index.meshes)
+    sources = scope_index.lights + emitters
+    _emission_cache.sources = (scope_index, generation, sources)
+    return (yield from fill_list_steps(scene, "ll_light_items", "ll_light_index", "obj", sources, "Updated Light Items:"))
+
+def iter_update_mesh_items(scene, context):
+    meshes = get_scope_index(scene, context).meshes
+    return fill_list_steps(scene, "ll_mesh_items", "ll_mesh_index", "obj", meshes, "Updated Mesh Items:")
+
+def iter_update_collection_items(scene, context):
+    linking_collections = get_linking_registry()
+    # Skip linking collections
+    collections = [coll for coll in get_scope_index(scene, context).collections if coll not in linking_collections]
+    return fill_list_steps(scene, "ll_collection_items", "ll_collection_index", "coll", collections, "Updated Collection Items:")
+
 def update_light_items(scene, context):
-    prev_sel = {item.name: item.selected for item in scene.ll_light_items}
-    scene.ll_light_items.clear()
-    for obj in scene.objects:
-        if obj.type == 'LIGHT':
-            item = scene.ll_light_items.add()
-            item.name = obj.name
-            item.obj = obj
-            item.selected = prev_sel.get(obj.name, False)
-    scene.ll_light_index = 0 if scene.ll_light_items else -1
-    print("Updated Light Items:", [item.name for item in scene.ll_light_items])
+    run_steps(iter_update_light_items(scene, context))
 
 def update_mesh_items(scene, context):
-    prev_sel = {item.name: item.selected for item in scene.ll_mesh_items}
-    scene.ll_mesh_items.clear()
-    for obj in scene.objects:
-        if obj.type == 'MESH':
-            item = scene.ll_mesh_items.add()
-            item.name = obj.name
-            item.obj = obj
-            item.selected = prev_sel.get(obj.name, False)
-    scene.ll_mesh_index = 0 if scene.ll_mesh_items else -1
-    print("Updated Mesh Items:", [item.name for item in scene.ll_mesh_items])
+    run_steps(iter_update_mesh_items(scene, context))
 
 def update_collection_items(scene, context):
-    prev_sel = {item.name: item.selected for item in scene.ll_collection_items}
-    scene.ll_collection_items.clear()
+    run_steps(iter_update_collection_items(scene, context))
+
+# Redraw requests made during one event loop pass are merged and flushed by a
+# single zero-interval timer. List changes only repaint the sidebar region.
+class RedrawRequest:
+    def __init__(self):
+        self.pending = False
+        self.viewport = False
+
+_redraw = RedrawRequest()
+
+def request_redraw(viewport=False):
+    _redraw.viewport |= viewport
+    if _redraw.pending:
+        return
+    _redraw.pending = True
+    bpy.app.timers.register(flush_redraw, first_interval=0.0)
+
+def flush_redraw():
+    viewport = _redraw.viewport
+    _redraw.pending = _redraw.viewport = False
+    # Timers run without a screen in the context, so walk every window instead.
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            if viewport:
+                area.tag_redraw()
+                continue
+            if not area.spaces.active.show_region_ui:
+                continue
+            for region in area.regions:
+                # Sidebars showing another tab are left alone where Blender tells us the tab.
+                if region.type == 'UI' and getattr(region, "active_panel_category", "Light Link") in ("Light Link", ""):
+                    region.tag_redraw()
+    return None
+
+def get_linking_group(light):
+    return light.light_linking.receiver_collection
+
+def ensure_linking_group(light):
+    group = light.light_linking.receiver_collection
+    if group:
+        # A collection the user set up is used as it is, not tagged as ours.
+        return group
+    # Built directly rather than with light_linking_receiver_collection_new, which
+    # would change the selection (and, with Sync on, untick the list rows).
+    group = bpy.data.collections.new(f"Light Linking for {light.name}")
+    light.light_linking.receiver_collection = group
+    tag_linking_collection(group)
+    return group
+
+# -------------------------------------------------------------------
+#   Linking Collection Registry (tagged with Collection.ll_linking_group)
+# -------------------------------------------------------------------
+# Set of tagged collections; None until the next lookup rebuilds it.
+_linking_registry = None
+
+def is_linking_collection(coll):
+    return coll.ll_linking_group
+
+def tag_linking_collection(coll):
+    if not coll.ll_linking_group:
+        coll.ll_linking_group = True
+    if _linking_registry is not None:
+        _linking_registry.add(coll)
+
+def invalidate_linking_registry():
+    global _linking_registry
+    _linking_registry = None
+
+def get_linking_registry():
+    global _linking_registry
+    if _linking_registry is None:
+        _linking_registry = {coll for coll in bpy.data.collections if coll.ll_linking_group}
+    return _linking_registry
+
+def placed_collections():
+    # Collections that are part of a scene or collection hierarchy.
+    placed = set()
+    for scene in bpy.data.scenes:
+        placed.update(scene.collection.children_recursive)
+    for coll in bpy.data.collections:
+        placed.update(coll.children)
+    return placed
+
+def migrate_linking_tags():
+    # Only collections the add-on created carry the tag. Earlier versions also
+    # tagged any collection used as a receiver/blocker collection; those that are
+    # placed in the user's hierarchy under their own name are given back.
+    tagged = 0
+    placed = placed_collections()
     for coll in bpy.data.collections:
-        if "Light Linking for" in coll.name:
-            continue  # Skip linking collections
-        item = scene.ll_collection_items.add()
-        item.name = coll.name
-        item.coll = coll
-        item.selected = prev_sel.get(coll.name, False)
-    scene.ll_collection_index = 0 if scene.ll_collection_items else -1
-    print("Updated Collection Items:", [item.name for item in scene.ll_collection_items])
+        if coll.ll_linking_group and coll in placed and not coll.name.startswith("Light Linking for ") and coll.library is None:
+            coll.ll_linking_group = False
+    # Files from before tagging existed: fall back to the old name rule exactly once.
+    if not any(scene.ll_linking_tags_migrated for scene in bpy.data.scenes):
+        for coll in bpy.data.collections:
+            if coll.name.startswith("Light Linking for ") and not coll.ll_linking_group and coll.library is None:
+                coll.ll_linking_group = True
+                tagged += 1
+        for scene in bpy.data.scenes:
+            scene.ll_linking_tags_migrated = True
+    invalidate_linking_registry()
+    return tagged
+
+def migrate_legacy_links():
+    # One-shot conversion of name-keyed links into native receiver collection pointers.
+    migrated = 0
+    for obj in bpy.data.objects:
+        group_name = obj.get(LEGACY_GROUP_PROP)
+        if group_name is None:
+            continue
+        group = bpy.data.collections.get(group_name)
+        if group and not obj.light_linking.receiver_collection:
+            obj.light_linking.receiver_collection = group
+            migrated += 1
+        del obj[LEGACY_GROUP_PROP]
+    return migrated
+
+@persistent
+def ll_load_post(dummy):
+    global _undo_state
+    # Session UIDs of the previous file mean nothing here, so nothing can be remapped.
+    _undo_state = None
+    if _scheduler.queue:
+        _scheduler.cancel_all()
+    drop_pointer_caches()
+    _emission_cache.clear()
+    invalidate_link_index()
+    # Isolation flags saved without their visibility state cannot be undone.
+    for scene in bpy.data.scenes:
+        if scene.ll_isolate_active and not scene.ll_isolate_state:
+            scene.ll_isolate_active = False
+            print(f"Light Link: scene '{scene.name}' was saved isolated without a stored visibility state; check hidden objects")
+    _selection_bits.clear()
+    migrate_row_selection()
+    # Message bus subscriptions do not survive loading a file.
+    subscribe_name_changes()
+    migrated = migrate_legacy_links()
+    if migrated:
+        print(f"Light Link: migrated {migrated} name-based link(s) to receiver collection pointers")
+    tagged = migrate_linking_tags()
+    if tagged:
+        print(f"Light Link: tagged {tagged} linking collection(s)")
+    # The snapshot is checked when the link index is first needed, not here.
+    load_link_snapshot()
+
+def get_active_light(scene):
+    # Prefer the active row of the Lights list, then the first ticked light.
+    if 0 <= scene.ll_light_index < len(scene.ll_light_items):
+        item = scene.ll_light_items[scene.ll_light_index]
+        if item.obj:
+            return item.obj
+    ticked = ticked_ids(scene, "ll_light_items")
+    return ticked[0] if ticked else None
 
-def force_redraw(context):
-    for area in context.screen.areas:
-        if area.type == 'VIEW_3D':
-            area.tag_redraw()
+# -------------------------------------------------------------------
+#   Link Index (light -> receivers/blockers) with a Persistent Snapshot
+# -------------------------------------------------------------------
+SNAPSHOT_TEXT = ".light_link_snapshot"
+SNAPSHOT_VERSION = 4
+
+# LinkEntry.library bits: which parts come from a library file. A .blend read
+# without its libraries cannot see their contents, so light_link_diff skips them.
+LIBRARY_LIGHT = 1
+LIBRARY_RECEIVERS = 2
+LIBRARY_BLOCKERS = 4
+
+# Receiver/blocker object names (nested child collections included, as Blender
+# resolves them) and the names of the collections holding them.
+LinkEntry = namedtuple("LinkEntry", "receivers blockers receiver_collection blocker_collection library", defaults=(0,))
+
+# (fingerprint, {light name: LinkEntry}) or None.
+_link_index = None
+# The file's saved snapshot is only decoded and checked on first use of the index;
+# False once it was used, found outdated or made outdated by an edit.
+_pending_snapshot = False
+# Index the snapshot text in the file currently describes.
+_snapshot_source = None
+
+def link_fingerprint():
+    # Cheap hash over object/collection counts and the linking collections' sizes;
+    # it changes whenever links are added or removed without walking every member.
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{len(bpy.data.objects)}:{len(bpy.data.collections)}".encode())
+    for name, size in sorted((coll.name_full, len(coll.objects)) for coll in get_linking_registry()):
+        digest.update(f"|{name}:{size}".encode())
+    return digest.hexdigest()
+
+def build_link_index():
+    index = {}
+    for obj in bpy.data.objects:
+        linking = obj.light_linking
+        receivers, blockers = linking.receiver_collection, linking.blocker_collection
+        if not receivers and not blockers:
+            continue
+        index[obj.name] = LinkEntry(
+            frozenset(o.name for o in collection_subtree(receivers)[0]) if receivers else frozenset(),
+            frozenset(o.name for o in collection_subtree(blockers)[0]) if blockers else frozenset(),
+            receivers.name if receivers else "",
+            blockers.name if blockers else "",
+            (LIBRARY_LIGHT if obj.library else 0)
+            | (LIBRARY_RECEIVERS if receivers and receivers.library else 0)
+            | (LIBRARY_BLOCKERS if blockers and blockers.library else 0),
+        )
+    return index
+
+def get_link_index():
+    global _link_index, _pending_snapshot
+    fingerprint = link_fingerprint()
+    if _link_index is None and _pending_snapshot:
+        _pending_snapshot = False
+        index = adopt_link_snapshot()
+        if index is not None:
+            _link_index = (fingerprint, index)
+    if _link_index is None or _link_index[0] != fingerprint:
+        _link_index = (fingerprint, build_link_index())
+    return _link_index[1]
+
+def invalidate_link_index():
+    global _link_index
+    _link_index = None
+
+def links_changed():
+    global _pending_snapshot
+    invalidate_link_index()
+    _pending_snapshot = False
+    _subtree_memo.clear()
+    mark_matrix_dirty()
+
+def encode_link_snapshot(fingerprint, index):
+    # Names are stored once in a table and referenced by position.
+    names = {}
+    def ref(name):
+        return names.setdefault(name, len(names))
+    rows = [
+        [
+            ref(light),
+            [ref(n) for n in sorted(entry.receivers)],
+            [ref(n) for n in sorted(entry.blockers)],
+            ref(entry.receiver_collection),
+            ref(entry.blocker_collection),
+            entry.library,
+        ]
+        for light, entry in index.items()
+    ]
+    payload = {"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "names": list(names), "rows": rows}
+    raw = zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 9)
+    return base64.b85encode(raw).decode("ascii")
+
+def decode_link_snapshot(text):
+    payload = json.loads(zlib.decompress(base64.b85decode(text)))
+    if payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    names = payload["names"]
+    index = {
+        names[light]: LinkEntry(
+            frozenset(names[i] for i in receivers),
+            frozenset(names[i] for i in blockers),
+            names[receiver_collection],
+            names[blocker_collection],
+            library,
+        )
+        for light, receivers, blockers, receiver_collection, blocker_collection, library in payload["rows"]
+    }
+    return payload["fingerprint"], index
+
+def snapshot_matches(index):
+    # Cheaper than a rebuild: each linked object's collection names and member
+    # counts are compared, without walking or hashing any members.
+    linked = 0
+    for obj in bpy.data.objects:
+        linking = obj.light_linking
+        receivers, blockers = linking.receiver_collection, linking.blocker_collection
+        if not receivers and not blockers:
+            continue
+        entry = index.get(obj.name)
+        if entry is None:
+            return False
+        linked += 1
+        for coll, names, coll_name in ((receivers, entry.receivers, entry.receiver_collection),
+                                       (blockers, entry.blockers, entry.blocker_collection)):
+            if (coll.name if coll else "") != coll_name or (coll and len(coll.all_objects) != len(names)):
+                return False
+    return linked == len(index)
+
+def adopt_link_snapshot():
+    global _snapshot_source
+    text = bpy.data.texts.get(SNAPSHOT_TEXT)
+    if text is None:
+        return None
+    try:
+        snapshot = decode_link_snapshot(text.as_string())
+    except (ValueError, zlib.error, KeyError, IndexError, TypeError):
+        return None
+    if snapshot is None or not snapshot_matches(snapshot[1]):
+        return None
+    _snapshot_source = snapshot[1]
+    return snapshot[1]
+
+def write_link_snapshot():
+    global _snapshot_source
+    text = bpy.data.texts.get(SNAPSHOT_TEXT)
+    if _link_index is None or _link_index[0] != link_fingerprint():
+        # The index was not used (or is outdated): nothing is built just to be saved.
+        # An unchecked snapshot from the file is kept, an outdated one dropped.
+        if text is not None and not _pending_snapshot:
+            bpy.data.texts.remove(text)
+            _snapshot_source = None
+        return
+    index = _link_index[1]
+    if text is not None and index is _snapshot_source:
+        return
+    text = text or bpy.data.texts.new(SNAPSHOT_TEXT)
+    text.from_string(encode_link_snapshot(_link_index[0], index))
+    text.use_fake_user = True
+    _snapshot_source = index
+
+def load_link_snapshot():
+    global _pending_snapshot, _snapshot_source
+    _snapshot_source = None
+    _pending_snapshot = bpy.data.texts.get(SNAPSHOT_TEXT) is not None
+    return _pending_snapshot
 
 # -------------------------------------------------------------------
 #   Operator to Toggle an Item’s Selection
 # -------------------------------------------------------------------
+TOGGLE_LISTS = {'LIGHT': "ll_light_items", 'MESH': "ll_mesh_items", 'COLLECTION': "ll_collection_items"}
+
 class LL_OT_ToggleSelection(bpy.types.Operator):
     bl_idname = "light_link.toggle_selection"
     bl_label = "Toggle Selection"
     bl_description = "Toggle the selection state for this item"
+    bl_options = {'UNDO'}
     
+    index: bpy.props.IntProperty(default=-1)
     item_name: bpy.props.StringProperty()
     item_type: bpy.props.EnumProperty(
         items=[
@@ -97,24 +1078,16 @@ class LL_OT_ToggleSelection(bpy.types.Operator):
     
     def execute(self, context):
         scene = context.scene
-        if self.item_type == 'LIGHT':
-            for item in scene.ll_light_items:
-                if item.name == self.item_name:
-                    item.selected = not item.selected
-                    break
-        elif self.item_type == 'MESH':
-            for item in scene.ll_mesh_items:
-                if item.name == self.item_name:
-                    item.selected = not item.selected
-                    break
-        elif self.item_type == 'COLLECTION':
-            for item in scene.ll_collection_items:
-                if item.name == self.item_name:
-                    item.selected = not item.selected
-                    break
-        else:
-            self.report({'WARNING'}, "Unknown item type")
+        items_prop = TOGGLE_LISTS[self.item_type]
+        items = getattr(scene, items_prop)
+        row = self.index
+        if self.item_name:
+            row = find_list_row(items, items_prop, self.item_name)
+        if row is None or not 0 <= row < len(items):
+            self.report({'WARNING'}, "Item is not in the list")
             return {'CANCELLED'}
+        bits = get_selection_bits(scene, items_prop)
+        set_row_selected(scene, items_prop, row, not is_row_selected(bits, row))
         return {'FINISHED'}
 
 # -------------------------------------------------------------------
@@ -123,26 +1096,24 @@ class LL_OT_ToggleSelection(bpy.types.Operator):
 class LL_OT_RefreshSelectedLights(bpy.types.Operator):
     bl_idname = "light_link.refresh_selected_lights"
     bl_label = "Refresh Selected Lights"
-    bl_description = "Filter the lights list to show only lights selected in the viewport. If none are selected, use the active light."
+    bl_description = "Filter the lights list to show only lights (and emissive meshes, if listed) selected in the viewport. If none are selected, use the active light."
     
     def execute(self, context):
         scene = context.scene
-        selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
+        selected_lights = [obj for obj in context.selected_objects if is_light_source(scene, obj)]
         if not selected_lights:
             active_obj = context.view_layer.objects.active
-            if active_obj and active_obj.type == 'LIGHT':
+            if active_obj and is_light_source(scene, active_obj):
                 selected_lights.append(active_obj)
         if not selected_lights:
             self.report({'WARNING'}, "No lights selected in the viewport")
             return {'CANCELLED'}
         scene.ll_light_items.clear()
         for obj in selected_lights:
-            item = scene.ll_light_items.add()
-            item.name = obj.name
-            item.obj = obj
-            item.selected = True
+            scene.ll_light_items.add().obj = obj
+        replace_selection(scene, "ll_light_items", all_rows_bits(len(selected_lights)))
         scene.ll_light_index = 0 if scene.ll_light_items else -1
-        force_redraw(context)
+        request_redraw()
         self.report({'INFO'}, f"Filtered lights to {len(selected_lights)} item(s)")
         return {'FINISHED'}
 
@@ -163,12 +1134,10 @@ class LL_OT_RefreshSelectedMeshes(bpy.types.Operator):
             return {'CANCELLED'}
         scene.ll_mesh_items.clear()
         for obj in selected_meshes:
-            item = scene.ll_mesh_items.add()
-            item.name = obj.name
-            item.obj = obj
-            item.selected = True
+            scene.ll_mesh_items.add().obj = obj
+        replace_selection(scene, "ll_mesh_items", all_rows_bits(len(selected_meshes)))
         scene.ll_mesh_index = 0 if scene.ll_mesh_items else -1
-        force_redraw(context)
+        request_redraw()
         self.report({'INFO'}, f"Filtered meshes to {len(selected_meshes)} item(s)")
         return {'FINISHED'}
 
@@ -188,7 +1157,7 @@ class LL_OT_RefreshSelectedCollections(bpy.types.Operator):
                 if isinstance(id_item, bpy.types.Collection):
                     selected_collections.append(id_item)
         if not selected_collections:
-            selected_collections = [item.coll for item in scene.ll_collection_items if item.selected and item.coll]
+            selected_collections = ticked_ids(scene, "ll_collection_items")
         if not selected_collections and scene.ll_collection_index >= 0:
             active_item = scene.ll_collection_items[scene.ll_collection_index]
             if active_item.coll:
@@ -198,14 +1167,10 @@ class LL_OT_RefreshSelectedCollections(bpy.types.Operator):
             return {'CANCELLED'}
         scene.ll_collection_items.clear()
         for coll in selected_collections:
-            item = scene.ll_collection_items.add()
-            item.name = coll.name
-            item.coll = coll
-            item.selected = True
+            scene.ll_collection_items.add().coll = coll
+        replace_selection(scene, "ll_collection_items", all_rows_bits(len(selected_collections)))
         scene.ll_collection_index = 0 if scene.ll_collection_items else -1
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+        request_redraw()
         self.report({'INFO'}, f"Filtered collections to {len(selected_collections)} item(s)")
         return {'FINISHED'}
 
@@ -215,9 +1180,9 @@ class LL_OT_RefreshAllLights(bpy.types.Operator):
     bl_description = "Display all lights in the scene"
     
     def execute(self, context):
-        update_light_items(context.scene, context)
-        force_redraw(context)
-        self.report({'INFO'}, f"Listed all {len(context.scene.ll_light_items)} lights")
+        scene = context.scene
+        submit_job(("refresh", scene.name, 'LIGHTS'), "Listing lights", iter_update_light_items(scene, context))
+        self.report({'INFO'}, "Listing all lights")
         return {'FINISHED'}
 
 class LL_OT_ResetLights(bpy.types.Operator):
@@ -226,9 +1191,8 @@ class LL_OT_ResetLights(bpy.types.Operator):
     bl_description = "Deselect all lights in the list"
     
     def execute(self, context):
-        for item in context.scene.ll_light_items:
-            item.selected = False
-        force_redraw(context)
+        replace_selection(context.scene, "ll_light_items", bytearray())
+        request_redraw()
         self.report({'INFO'}, "Light selections reset")
         return {'FINISHED'}
 
@@ -238,9 +1202,9 @@ class LL_OT_RefreshAllMeshes(bpy.types.Operator):
     bl_description = "Display all meshes in the scene"
     
     def execute(self, context):
-        update_mesh_items(context.scene, context)
-        force_redraw(context)
-        self.report({'INFO'}, f"Listed all {len(context.scene.ll_mesh_items)} meshes")
+        scene = context.scene
+        submit_job(("refresh", scene.name, 'MESHES'), "Listing meshes", iter_update_mesh_items(scene, context))
+        self.report({'INFO'}, "Listing all meshes")
         return {'FINISHED'}
 
 class LL_OT_ResetMeshes(bpy.types.Operator):
@@ -249,9 +1213,8 @@ class LL_OT_ResetMeshes(bpy.types.Operator):
     bl_description = "Deselect all meshes in the list"
     
     def execute(self, context):
-        for item in context.scene.ll_mesh_items:
-            item.selected = False
-        force_redraw(context)
+        replace_selection(context.scene, "ll_mesh_items", bytearray())
+        request_redraw()
         self.report({'INFO'}, "Mesh selections reset")
         return {'FINISHED'}
 
@@ -261,193 +1224,1921 @@ class LL_OT_ResetCollections(bpy.types.Operator):
     bl_description = "Deselect all collections in the list"
     
     def execute(self, context):
-        for item in context.scene.ll_collection_items:
-            item.selected = False
-        force_redraw(context)
+        replace_selection(context.scene, "ll_collection_items", bytearray())
+        request_redraw()
         self.report({'INFO'}, "Collection selections reset")
         return {'FINISHED'}
 
 # -------------------------------------------------------------------
 #   Operators for Linking/Unlinking
 # -------------------------------------------------------------------
-class LL_OT_Link(bpy.types.Operator):
+class LL_OT_Link(ListsReadyPoll, bpy.types.Operator):
     bl_idname = "light_link.link"
     bl_label = "Link Lights to Objects"
     bl_description = (
         "For each selected light, create (or use an existing) light linking receiver collection and add "
-        "the selected meshes (including those from selected collections) to it, storing the linking group in a custom property."
+        "the selected meshes (including those from selected collections) to it, assigning it as the light's receiver collection."
     )
     
     def execute(self, context):
         scene = context.scene
-        selected_lights = [item.obj for item in scene.ll_light_items if item.selected and item.obj]
-        selected_meshes = [item.obj for item in scene.ll_mesh_items if item.selected and item.obj]
-        collection_meshes = []
-        for item in scene.ll_collection_items:
-            if item.selected and item.coll:
-                for obj in item.coll.all_objects:
-                    if obj.type == 'MESH':
-                        collection_meshes.append(obj)
+        if scene.ll_link_target == 'GROUP':
+            return self.execute_group(context)
+        selected_lights = ticked_ids(scene, "ll_light_items")
         
         if not selected_lights:
             self.report({'WARNING'}, "No lights selected")
             return {'CANCELLED'}
         
-        all_meshes = {obj.name: obj for obj in (selected_meshes + collection_meshes)}.values()
-        if not list(all_meshes):
+        all_meshes = gather_link_receivers(scene, context)
+        if not all_meshes:
             self.report({'WARNING'}, "No mesh objects selected")
             return {'CANCELLED'}
-        
-        total_linked_meshes = 0
-        for light in selected_lights:
-            bpy.ops.object.select_all(action='DESELECT')
-            light.select_set(True)
-            context.view_layer.objects.active = light
+        return link_lights(self, context, selected_lights, all_meshes)
 
-            group_name = light.get("light_linking_receiver_collection") or f"Light Linking for {light.name}"
-            new_group = bpy.data.collections.get(group_name)
-            if not new_group:
-                try:
-                    bpy.ops.object.light_linking_receiver_collection_new()
-                    group_name = light.get("light_linking_receiver_collection") or group_name
-                    new_group = bpy.data.collections.get(group_name)
-                    if not new_group:
-                        self.report({'WARNING'}, f"Failed to create linking group '{group_name}' for {light.name}")
-                        continue
-                except Exception as e:
-                    self.report({'ERROR'}, f"Error creating linking group for {light.name}: {str(e)}")
-                    continue
-            linked_meshes = 0
-            for obj in all_meshes:
-                if obj.name not in new_group.objects:
-                    new_group.objects.link(obj)
-                    linked_meshes += 1
-            light["light_linking_receiver_collection"] = group_name
-            total_linked_meshes += linked_meshes
-        
-        self.report({'INFO'}, f"Linked {len(selected_lights)} light(s) to {total_linked_meshes} mesh(es)")
+    def execute_group(self, context):
+        scene = context.scene
+        group = get_active_light_group(scene)
+        if not group:
+            self.report({'WARNING'}, "No light group selected")
+            return {'CANCELLED'}
+        receivers = gather_link_receivers(scene, context)
+        if not receivers:
+            self.report({'WARNING'}, "No mesh objects selected")
+            return {'CANCELLED'}
+        linked, light_count, failures = link_light_group(context, group, receivers)
+        links_changed()
+        report_link_failures(self, failures)
+        self.report({'INFO'}, f"Linked group '{group.name}' ({light_count} light(s)) to {linked} mesh(es)")
         return {'FINISHED'}
 
-class LL_OT_Unlink(bpy.types.Operator):
+class LL_OT_Unlink(ListsReadyPoll, bpy.types.Operator):
     bl_idname = "light_link.unlink"
     bl_label = "Unlink Lights from Objects"
     bl_description = (
-        "For each selected light, remove the objects (from the Mesh and Collection lists) "
-        "that are linked via the light linking receiver collection and clear the linking property."
+        "For each selected light, remove the ticked meshes and the meshes of ticked collections "
+        "from its light linking receiver collection. The receiver collection pointer is only cleared "
+        "once the collection is empty."
     )
     
     def execute(self, context):
         scene = context.scene
-        selected_lights = [item.obj for item in scene.ll_light_items if item.selected and item.obj]
+        if scene.ll_link_target == 'GROUP':
+            return self.execute_group(context)
+        selected_lights = ticked_ids(scene, "ll_light_items")
         if not selected_lights:
             self.report({'WARNING'}, "No lights selected")
             return {'CANCELLED'}
         
+        targets = set(gather_link_receivers(scene, context))
+        if not targets:
+            self.report({'WARNING'}, "No mesh objects selected")
+            return {'CANCELLED'}
+        
         total_removed = 0
+        failures = []
+        processed = set()
         for light in selected_lights:
-            group_name = light.get("light_linking_receiver_collection")
-            if not group_name:
-                continue
-            linking_group = bpy.data.collections.get(group_name)
+            linking_group = get_linking_group(light)
             if not linking_group:
                 continue
-            removed = 0
-            for obj in list(linking_group.objects):
-                if obj.name in [m_obj.name for m_obj in scene.ll_mesh_items if m_obj.selected]:
+            # Lights can share a receiver collection; each collection is only edited once.
+            if linking_group not in processed:
+                processed.add(linking_group)
+                if id_edit_state(linking_group) != 'EDITABLE':
+                    failures.append((light.name, f"linking group '{linking_group.name}' comes from a library"))
+                    continue
+                removed = targets.intersection(linking_group.objects)
+                for obj in removed:
                     linking_group.objects.unlink(obj)
-                    removed += 1
-            total_removed += removed
-            if "light_linking_receiver_collection" in light:
-                del light["light_linking_receiver_collection"]
+                total_removed += len(removed)
+            if not linking_group.objects and not linking_group.children:
+                try:
+                    light.light_linking.receiver_collection = None
+                except (AttributeError, RuntimeError) as e:
+                    failures.append((light.name, str(e)))
+        links_changed()
+        journal_entry('UNLINK', selected_lights, targets)
+        report_link_failures(self, failures)
         self.report({'INFO'}, f"Unlinked objects from {len(selected_lights)} light(s); removed {total_removed} object(s)")
         return {'FINISHED'}
 
+    def execute_group(self, context):
+        scene = context.scene
+        group = get_active_light_group(scene)
+        if not group:
+            self.report({'WARNING'}, "No light group selected")
+            return {'CANCELLED'}
+        removed = unlink_light_group(group, gather_link_receivers(scene, context))
+        links_changed()
+        self.report({'INFO'}, f"Unlinked {removed} object(s) from group '{group.name}'")
+        return {'FINISHED'}
+
+# Link jobs up to this many light x receiver pairs run synchronously.
+JOB_SYNC_LIMIT = 20000
+LINK_CHUNK = 500
+
+def link_receivers_steps(targets, receivers, failures, background=False):
+    total_linked_meshes = 0
+    pending = 0
+    # (light, receivers it is linked to now); journaled even if the job is cancelled.
+    results = []
+    try:
+        for light, group in targets:
+            current = set(group.objects)
+            linked = []
+            results.append((light, linked))
+            for obj in receivers:
+                if obj in current:
+                    linked.append(obj)
+                    continue
+                try:
+                    group.objects.link(obj)
+                    linked.append(obj)
+                    total_linked_meshes += 1
+                except RuntimeError as e:
+                    failures.append((f"{light.name} -> {obj.name}", str(e)))
+                pending += 1
+                if pending >= LINK_CHUNK:
+                    pending = 0
+                    yield light.name
+    finally:
+        links_changed()
+        journal_link_results(results, receivers)
+    message = f"Linked {len(targets)} light(s) to {total_linked_meshes} mesh(es)"
+    if background and failures:
+        # No operator is left to report to; list the failures on the console instead.
+        for name, reason in failures:
+            print(f"Light Link: {name}: {reason}")
+        message += f", {len(failures)} link(s) failed (see console)"
+    return message
+
+def link_lights(operator, context, lights, receivers):
+    scene = context.scene
+    lights, failures = make_lights_editable(context, lights)
+    # Groups are created up front; filling them is the heavy part and can run
+    # in the background.
+    targets = []
+    for light in lights:
+        try:
+            new_group = ensure_linking_group(light)
+            if not new_group:
+                operator.report({'WARNING'}, f"Failed to create linking group for {light.name}")
+                continue
+        except Exception as e:
+            operator.report({'ERROR'}, f"Error creating linking group for {light.name}: {str(e)}")
+            continue
+        if id_edit_state(new_group) != 'EDITABLE':
+            failures.append((light.name, f"linking group '{new_group.name}' comes from a library"))
+            continue
+        targets.append((light, new_group))
+
+    if len(targets) * len(receivers) > JOB_SYNC_LIMIT:
+        steps = link_receivers_steps(targets, receivers, failures, background=True)
+        submit_job(("link", scene.name, id(steps)), "Linking", steps)
+        operator.report({'INFO'}, f"Linking {len(targets)} light(s) in the background")
+        return {'FINISHED'}
+    message = run_steps(link_receivers_steps(targets, receivers, failures))
+    report_link_failures(operator, failures)
+    operator.report({'INFO'}, message)
+    return {'FINISHED'}
+
+def collect_receivers(scope_index, meshes, collections, include_children):
+    # Meshes plus the in-scope meshes of the collections (and optionally
+    # their child objects), without duplicates.
+    receivers = dict.fromkeys(meshes)
+    receivers.update(dict.fromkeys(expand_collections(collections) & scope_index.mesh_set))
+    if include_children:
+        receivers.update(dict.fromkeys(expand_children(scope_index, list(receivers)) & scope_index.mesh_set))
+    return list(receivers)
+
+def gather_link_receivers(scene, context):
+    return collect_receivers(
+        get_scope_index(scene, context),
+        ticked_ids(scene, "ll_mesh_items"),
+        ticked_ids(scene, "ll_collection_items"),
+        scene.ll_include_children,
+    )
+
 # -------------------------------------------------------------------
-#   UIList Classes for Scrollable Lists
+#   Light Groups (named sets of lights sharing one receiver collection)
 # -------------------------------------------------------------------
-class LL_UL_LightList_UI(bpy.types.UIList):
-    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        self.use_filter_show = True
-        row = layout.row(align=True)
-        row.prop(item, "selected", text="")  # Checkbox for selection
-        row.label(text=item.name)
+def get_active_light_group(scene):
+    if 0 <= scene.ll_light_group_index < len(scene.ll_light_groups):
+        return scene.ll_light_groups[scene.ll_light_group_index]
+    return None
 
-class LL_UL_MeshList_UI(bpy.types.UIList):
-    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        self.use_filter_show = True
-        row = layout.row(align=True)
-        row.prop(item, "selected", text="")
-        row.label(text=item.name)
+def ensure_group_collection(group):
+    coll = group.receiver_collection
+    if coll is None:
+        coll = bpy.data.collections.new(f"Light Linking for {group.name}")
+        group.receiver_collection = coll
+        tag_linking_collection(coll)
+    return coll
 
-class LL_UL_CollectionList_UI(bpy.types.UIList):
-    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        self.use_filter_show = True
-        row = layout.row(align=True)
-        row.prop(item, "selected", text="")
-        row.label(text=item.name)
+def link_light_group(context, group, receivers):
+    # All members share one receiver collection, so the receivers are linked once
+    # and each light only gets its pointer assigned.
+    lights, failures = make_lights_editable(context, [member.obj for member in group.lights if member.obj])
+    coll = ensure_group_collection(group)
+    current = set(coll.objects)
+    linked = 0
+    failed = set()
+    for obj in receivers:
+        if obj in current:
+            continue
+        try:
+            coll.objects.link(obj)
+            linked += 1
+        except RuntimeError as e:
+            failed.add(obj)
+            failures.append((f"{group.name} -> {obj.name}", str(e)))
+    members = []
+    for light in lights:
+        own = light.light_linking.receiver_collection
+        if own is not None and own != coll and (own.objects or own.children):
+            # Taking the group collection would silently drop this light's own links.
+            failures.append((light.name, f"already links through '{own.name}'; unlink it before linking group '{group.name}'"))
+            continue
+        if own != coll:
+            light.light_linking.receiver_collection = coll
+        members.append(light)
+    journal_entry('LINK', members, [obj for obj in receivers if obj not in failed])
+    return linked, len(members), failures
+
+def unlink_light_group(group, receivers):
+    coll = group.receiver_collection
+    if coll is None:
+        return 0
+    targets = set(receivers).intersection(coll.objects)
+    for obj in targets:
+        coll.objects.unlink(obj)
+    members = [member.obj for member in group.lights if member.obj and member.obj.light_linking.receiver_collection == coll]
+    journal_entry('UNLINK', members, targets)
+    if not coll.objects:
+        # Nothing left to receive light; let the members go back to lighting everything.
+        for member in group.lights:
+            if member.obj and member.obj.light_linking.receiver_collection == coll:
+                member.obj.light_linking.receiver_collection = None
+    return len(targets)
+
+class LL_OT_LightGroupAdd(bpy.types.Operator):
+    bl_idname = "light_link.light_group_add"
+    bl_label = "Add Light Group"
+    bl_description = "Store the lights ticked in the Lights list as a named light group"
+
+    name: bpy.props.StringProperty(name="Name", default="Light Group")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        lights = ticked_ids(scene, "ll_light_items")
+        if not lights:
+            self.report({'WARNING'}, "No lights selected")
+            return {'CANCELLED'}
+        group = scene.ll_light_groups.add()
+        group.name = self.name
+        for light in lights:
+            group.lights.add().obj = light
+        scene.ll_light_group_index = len(scene.ll_light_groups) - 1
+        self.report({'INFO'}, f"Created light group '{group.name}' with {len(lights)} light(s)")
+        return {'FINISHED'}
+
+class LL_OT_LightGroupRemove(bpy.types.Operator):
+    bl_idname = "light_link.light_group_remove"
+    bl_label = "Remove Light Group"
+    bl_description = "Remove the active light group (its lights and receiver collection are kept)"
+
+    def execute(self, context):
+        scene = context.scene
+        if not get_active_light_group(scene):
+            return {'CANCELLED'}
+        scene.ll_light_groups.remove(scene.ll_light_group_index)
+        scene.ll_light_group_index = min(scene.ll_light_group_index, len(scene.ll_light_groups) - 1)
+        return {'FINISHED'}
+
+class LL_OT_LightGroupSelect(bpy.types.Operator):
+    bl_idname = "light_link.light_group_select"
+    bl_label = "Tick Group Lights"
+    bl_description = "Tick exactly the members of the active light group in the Lights list"
+
+    def execute(self, context):
+        scene = context.scene
+        group = get_active_light_group(scene)
+        if not group:
+            return {'CANCELLED'}
+        members = {member.obj for member in group.lights if member.obj}
+        bits = bytearray()
+        for row, item in enumerate(scene.ll_light_items):
+            if item.obj in members:
+                set_row_bit(bits, row, True)
+        replace_selection(scene, "ll_light_items", bits)
+        request_redraw()
+        return {'FINISHED'}
 
 # -------------------------------------------------------------------
-#   Panel – Three Columns with the UILists on Top, a Shared List Height Slider,
-#   and the Operator Buttons (for each column) below the slider; Link/Unlink Below
+#   Link-Set Algebra between Lights
 # -------------------------------------------------------------------
-class LL_PT_Panel(bpy.types.Panel):
-    bl_label = "Light Link"
-    bl_idname = "LL_PT_panel"
-    bl_space_type = "VIEW_3D"
-    bl_region_type = "UI"
-    bl_category = "Light Link"
-    
-    def draw(self, context):
-        layout = self.layout
+def combine_receiver_sets(operation, target, source):
+    if operation == 'COPY':
+        return set(source)
+    if operation == 'UNION':
+        return target | source
+    if operation == 'INTERSECT':
+        return target & source
+    return target - source
+
+def receiver_collection_users():
+    return Counter(
+        obj.light_linking.receiver_collection for obj in bpy.data.objects
+        if obj.light_linking.receiver_collection
+    )
+
+def apply_receiver_set(context, light, wanted):
+    # Only the difference between the current and wanted sets is linked/unlinked.
+    group = get_linking_group(light)
+    current = set(group.objects) if group else set()
+    to_link, to_unlink = wanted - current, current - wanted
+    if to_link and not group:
+        group = ensure_linking_group(light)
+    if not group:
+        return 0, 0
+    for obj in to_unlink:
+        group.objects.unlink(obj)
+    for obj in to_link:
+        group.objects.link(obj)
+    journal_edits([
+        ('UNLINK', [light.name], sorted(obj.name for obj in to_unlink)),
+        ('LINK', [light.name], sorted(obj.name for obj in to_link)),
+    ])
+    return len(to_link), len(to_unlink)
+
+class LL_OT_LinkSetOp(ListsReadyPoll, bpy.types.Operator):
+    bl_idname = "light_link.link_set_op"
+    bl_label = "Combine Receivers"
+    bl_description = (
+        "Combine the receivers of the active light in the Lights list into every other ticked light. "
+        "Lights that share their receiver collection with other lights are skipped"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    operation: bpy.props.EnumProperty(
+        items=[
+            ('COPY', "Copy", "Replace the ticked lights' receivers with the active light's receivers"),
+            ('UNION', "Union", "Add the active light's receivers to the ticked lights"),
+            ('INTERSECT', "Intersect", "Keep only the receivers the ticked lights share with the active light"),
+            ('SUBTRACT', "Subtract", "Remove the active light's receivers from the ticked lights"),
+        ]
+    )
+
+    def execute(self, context):
         scene = context.scene
+        source = get_active_light(scene)
+        if not source:
+            self.report({'WARNING'}, "No active light to take receivers from")
+            return {'CANCELLED'}
+        targets = [light for light in ticked_ids(scene, "ll_light_items") if light != source]
+        if not targets:
+            self.report({'WARNING'}, "Tick the lights to apply the receivers to")
+            return {'CANCELLED'}
+        source_group = get_linking_group(source)
+        source_set = set(source_group.objects) if source_group else set()
+        group_users = receiver_collection_users()
 
-        # First row: UILists for Lights, Meshes, and Collections
-        main_row = layout.row(align=True)
-        
-        # Lights Column (only UIList)
-        col_lights = main_row.column(align=True)
-        col_lights.label(text="Lights")
-        col_lights.template_list("LL_UL_LightList_UI", "", scene, "ll_light_items", scene, "ll_light_index", rows=scene.ll_list_rows)
-        
-        # Meshes Column (only UIList)
-        col_meshes = main_row.column(align=True)
-        col_meshes.label(text="Meshes")
-        col_meshes.template_list("LL_UL_MeshList_UI", "", scene, "ll_mesh_items", scene, "ll_mesh_index", rows=scene.ll_list_rows)
-        
-        # Collections Column (only UIList)
-        col_colls = main_row.column(align=True)
-        col_colls.label(text="Collections")
-        col_colls.template_list("LL_UL_CollectionList_UI", "", scene, "ll_collection_items", scene, "ll_collection_index", rows=scene.ll_list_rows)
-        
-        layout.separator()
-        # Shared slider for list height
-        layout.prop(scene, "ll_list_rows", text="List Height")
-        
-        layout.separator()
-        # Second row: Operator Buttons for each column below the slider
-        op_row = layout.row(align=True)
-        
-        col_light_ops = op_row.column(align=True)
-        col_light_ops.operator("light_link.refresh_selected_lights", text="Selected Lights")
-        col_light_ops.operator("light_link.refresh_all_lights", text="All Lights")
-        col_light_ops.operator("light_link.reset_lights", text="Reset")
-        
-        col_mesh_ops = op_row.column(align=True)
-        col_mesh_ops.operator("light_link.refresh_selected_meshes", text="Selected Meshes")
-        col_mesh_ops.operator("light_link.refresh_all_meshes", text="All Meshes")
-        col_mesh_ops.operator("light_link.reset_meshes", text="Reset")
-        
-        col_coll_ops = op_row.column(align=True)
-        # Collections only have a Reset operator; add dummy labels for alignment.
-        col_coll_ops.label(text="")  # dummy
-        col_coll_ops.label(text="")  # dummy
-        col_coll_ops.operator("light_link.reset_collections", text="Reset")
-        
-        layout.separator()
-        # Third row: Link and Unlink buttons placed side by side.
-        link_row = layout.row(align=True)
-        link_row.operator("light_link.link", text="Link")
-        link_row.operator("light_link.unlink", text="Unlink")
+        targets, failures = make_lights_editable(context, targets)
+        linked = unlinked = changed = 0
+        for light in targets:
+            group = get_linking_group(light)
+            if group and (group == source_group or group_users[group] > 1):
+                failures.append((light.name, f"receiver collection '{group.name}' is shared with other lights"))
+                continue
+            wanted = combine_receiver_sets(self.operation, set(group.objects) if group else set(), source_set)
+            try:
+                added, removed = apply_receiver_set(context, light, wanted)
+            except RuntimeError as e:
+                failures.append((light.name, str(e)))
+                continue
+            linked += added
+            unlinked += removed
+            changed += bool(added or removed)
+        links_changed()
+        report_link_failures(self, failures)
+        self.report({'INFO'}, f"Updated {changed} light(s): linked {linked}, unlinked {unlinked} receiver(s)")
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Preset Library (named link recipes in the shared presets folders)
+# -------------------------------------------------------------------
+# Recipes are JSON files in every "presets/light_link" folder Blender knows
+# about, so studio-wide script directories share them. A recipe stores the
+# names of the ticked lights, meshes and collections.
+PRESET_SUBDIR = "light_link"
+PRESET_VERSION = 1
+PRESET_RESCAN_INTERVAL = 1.0
+
+class PresetLibrary:
+    """Parsed recipes per file; a rescan only re-reads files whose mtime changed."""
+
+    def __init__(self):
+        self.files = {}
+        self.recipes = {}
+        self.items = []
+        self.last_scan = None
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.last_scan is not None and now - self.last_scan < PRESET_RESCAN_INTERVAL:
+            return self.recipes
+        self.last_scan = now
+        files = {}
+        recipes = {}
+        for directory in bpy.utils.preset_paths(PRESET_SUBDIR):
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                key = os.path.splitext(entry.name)[0]
+                if key in recipes:
+                    continue  # Earlier folders (the user's own) take precedence.
+                mtime = entry.stat().st_mtime_ns
+                cached = self.files.get(entry.path)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, read_preset(entry.path))
+                files[entry.path] = cached
+                if cached[1] is not None:
+                    recipes[key] = (entry.path, cached[1])
+        self.files = files
+        if recipes.keys() != self.recipes.keys() or any(
+            recipes[key][1] is not self.recipes[key][1] for key in recipes
+        ):
+            # Blender only keeps references to enum strings, so hold on to them here.
+            self.items = [
+                (key, recipe["name"], f"{len(recipe['lights'])} light(s), {os.path.dirname(path)}")
+                for key, (path, recipe) in sorted(recipes.items(), key=lambda item: item[1][1]["name"].lower())
+            ]
+        self.recipes = recipes
+        return recipes
+
+    def invalidate(self):
+        self.last_scan = None
+
+_preset_library = PresetLibrary()
+
+def read_preset(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            recipe = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Light Link: skipping preset {path}: {e}")
+        return None
+    if not isinstance(recipe, dict) or recipe.get("version") != PRESET_VERSION:
+        return None
+    recipe.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    for key in ("lights", "meshes", "collections"):
+        recipe[key] = [name for name in recipe.get(key, ()) if isinstance(name, str)]
+    recipe["include_children"] = bool(recipe.get("include_children", False))
+    return recipe
+
+def preset_enum_items(self, context):
+    _preset_library.refresh()
+    return _preset_library.items or [('NONE', "No presets", "")]
+
+def user_preset_dir():
+    return bpy.utils.user_resource('SCRIPTS', path=os.path.join("presets", PRESET_SUBDIR), create=True)
+
+class LL_OT_PresetSave(bpy.types.Operator):
+    bl_idname = "light_link.preset_save"
+    bl_label = "Save Link Preset"
+    bl_description = "Store the ticked lights, meshes and collections as a named link recipe in your presets folder"
+
+    name: bpy.props.StringProperty(name="Name", default="Link Preset")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        recipe = {
+            "version": PRESET_VERSION,
+            "name": self.name,
+            "lights": [obj.name for obj in ticked_ids(scene, "ll_light_items")],
+            "meshes": [obj.name for obj in ticked_ids(scene, "ll_mesh_items")],
+            "collections": [coll.name for coll in ticked_ids(scene, "ll_collection_items")],
+            "include_children": scene.ll_include_children,
+        }
+        if not recipe["lights"]:
+            self.report({'WARNING'}, "No lights selected")
+            return {'CANCELLED'}
+        path = os.path.join(user_preset_dir(), bpy.path.clean_name(self.name) + ".json")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(recipe, f, indent=2)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write preset: {str(e)}")
+            return {'CANCELLED'}
+        _preset_library.invalidate()
+        self.report({'INFO'}, f"Saved preset '{self.name}'")
+        return {'FINISHED'}
+
+class LL_OT_PresetApply(bpy.types.Operator):
+    bl_idname = "light_link.preset_apply"
+    bl_label = "Apply Link Preset"
+    bl_description = "Link the lights of a preset to its meshes and collections in one batched operation"
+    bl_property = "preset"
+
+    preset: bpy.props.EnumProperty(name="Preset", items=preset_enum_items)
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        entry = _preset_library.refresh().get(self.preset)
+        if entry is None:
+            self.report({'WARNING'}, "Preset not found")
+            return {'CANCELLED'}
+        recipe = entry[1]
+        scene = context.scene
+        objects, collections = bpy.data.objects, bpy.data.collections
+        lights = [obj for obj in map(objects.get, recipe["lights"]) if obj and is_light_source(scene, obj)]
+        meshes = [obj for obj in map(objects.get, recipe["meshes"]) if obj and obj.type == 'MESH']
+        colls = [coll for coll in map(collections.get, recipe["collections"]) if coll]
+        missing = sum(len(recipe[key]) for key in ("lights", "meshes", "collections")) - len(lights) - len(meshes) - len(colls)
+        if missing:
+            self.report({'WARNING'}, f"{missing} name(s) of preset '{recipe['name']}' are not in this file")
+        if not lights:
+            self.report({'WARNING'}, "None of the preset's lights exist in this file")
+            return {'CANCELLED'}
+        receivers = collect_receivers(get_scope_index(scene, context), meshes, colls, recipe["include_children"])
+        if not receivers:
+            self.report({'WARNING'}, "None of the preset's meshes are in scope")
+            return {'CANCELLED'}
+        return link_lights(self, context, lights, receivers)
+
+class LL_OT_PresetRemove(bpy.types.Operator):
+    bl_idname = "light_link.preset_remove"
+    bl_label = "Remove Link Preset"
+    bl_description = "Delete a link preset file"
+    bl_property = "preset"
+
+    preset: bpy.props.EnumProperty(name="Preset", items=preset_enum_items)
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        entry = _preset_library.refresh().get(self.preset)
+        if entry is None:
+            self.report({'WARNING'}, "Preset not found")
+            return {'CANCELLED'}
+        try:
+            os.remove(entry[0])
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not remove preset: {str(e)}")
+            return {'CANCELLED'}
+        _preset_library.invalidate()
+        self.report({'INFO'}, f"Removed preset '{entry[1]['name']}'")
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Isolate-by-Light Preview (visibility state stored on the scene)
+# -------------------------------------------------------------------
+# Scene.ll_isolate_state holds the object names in scene.objects order and the
+# packed hide flags, so a file saved while isolated can still be restored.
+# Each byte holds bit 0 = hide_viewport and bit 1 = hide_render.
+def encode_isolation(names, packed):
+    raw = zlib.compress(json.dumps([list(names), list(packed)], separators=(",", ":")).encode(), 1)
+    return base64.b85encode(raw).decode("ascii")
+
+def decode_isolation(text):
+    if not text:
+        return None
+    try:
+        names, flags = json.loads(zlib.decompress(base64.b85decode(text)))
+    except (ValueError, zlib.error):
+        return None
+    return names, array('B', flags)
+
+def isolate_light(scene, light):
+    objects = scene.objects
+    count = len(objects)
+    hide_viewport = [False] * count
+    hide_render = [False] * count
+    objects.foreach_get("hide_viewport", hide_viewport)
+    objects.foreach_get("hide_render", hide_render)
+    names = tuple(obj.name for obj in objects)
+    scene.ll_isolate_state = encode_isolation(
+        names,
+        array('B', [v | (r << 1) for v, r in zip(hide_viewport, hide_render)]),
+    )
+
+    group = get_linking_group(light)
+    if group:
+        keep = {light.name}
+        keep.update(obj.name for obj in collection_subtree(group)[0])
+        hidden = [name not in keep for name in names]
+    else:
+        # Without a receiver collection the light lights everything: only the
+        # other lights are hidden.
+        hidden = [obj.type == 'LIGHT' and obj != light for obj in objects]
+    objects.foreach_set("hide_viewport", [v or h for v, h in zip(hide_viewport, hidden)])
+    objects.foreach_set("hide_render", [r or h for r, h in zip(hide_render, hidden)])
+    return count - sum(hidden)
+
+def restore_isolation(scene):
+    stored = decode_isolation(scene.ll_isolate_state)
+    scene.ll_isolate_state = ""
+    if stored is None:
+        return False
+    names, packed = stored
+    objects = scene.objects
+    if len(objects) == len(names) and all(obj.name == name for obj, name in zip(objects, names)):
+        # Scene unchanged since isolating: restore each flag in a single pass.
+        objects.foreach_set("hide_viewport", [bool(b & 1) for b in packed])
+        objects.foreach_set("hide_render", [bool(b & 2) for b in packed])
+    else:
+        # Objects were added/removed meanwhile; restore the ones we know by name.
+        for name, b in zip(names, packed):
+            obj = objects.get(name)
+            if obj:
+                obj.hide_viewport = bool(b & 1)
+                obj.hide_render = bool(b & 2)
+    return True
+
+class LL_OT_IsolateLight(bpy.types.Operator):
+    bl_idname = "light_link.isolate_light"
+    bl_label = "Isolate Light"
+    bl_description = (
+        "Toggle hiding every object that is not linked to the active light in the Lights list "
+        "(including all other lights). Turning it off restores the previous visibility"
+    )
+
+    def execute(self, context):
+        scene = context.scene
+        if scene.ll_isolate_active:
+            scene.ll_isolate_active = False
+            if not restore_isolation(scene):
+                self.report({'WARNING'}, "No stored visibility state to restore")
+                return {'CANCELLED'}
+            # foreach_set sends no notifiers, so the 3D view itself must be repainted.
+            request_redraw(viewport=True)
+            self.report({'INFO'}, "Restored object visibility")
+            return {'FINISHED'}
+
+        light = get_active_light(scene)
+        if not light:
+            self.report({'WARNING'}, "No light selected")
+            return {'CANCELLED'}
+        visible = isolate_light(scene, light)
+        scene.ll_isolate_active = True
+        request_redraw(viewport=True)
+        self.report({'INFO'}, f"Isolated {light.name}: {visible} object(s) left visible")
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Link Matrix (lights x receivers, sparse storage)
+# -------------------------------------------------------------------
+class LinkMatrix:
+    """Sparse light x receiver matrix: each light name maps to the set of linked column names."""
+
+    def __init__(self):
+        self.rows = []
+        self.columns = []
+        self.members = {}
+        self.cells = {}
+        self.pending = {}
+        self.scene_name = ""
+        self.dirty = True
+
+    def rebuild(self, scene):
+        lights = ticked_ids(scene, "ll_light_items")
+        if not lights:
+            lights = listed_ids(scene, "ll_light_items")
+        if scene.ll_matrix_mode == 'MESHES':
+            sources = ticked_ids(scene, "ll_mesh_items")
+            if not sources:
+                sources = listed_ids(scene, "ll_mesh_items")
+            self.members = {obj.name: frozenset((obj.name,)) for obj in sources}
+        else:
+            sources = ticked_ids(scene, "ll_collection_items")
+            if not sources:
+                sources = listed_ids(scene, "ll_collection_items")
+            self.members = {
+                coll.name: frozenset(obj.name for obj in collection_subtree(coll)[0] if obj.type == 'MESH')
+                for coll in sources
+            }
+        self.rows = [light.name for light in lights]
+        self.columns = list(self.members)
+
+        # A cell is set when every mesh of the column is in the light's linking group.
+        self.cells = {}
+        link_index = get_link_index()
+        for light in lights:
+            entry = link_index.get(light.name)
+            if not entry:
+                continue
+            linked = entry.receivers
+            on = {column for column, names in self.members.items() if names and names <= linked}
+            if on:
+                self.cells[light.name] = on
+        rows, columns = set(self.rows), set(self.members)
+        self.pending = {
+            key: value for key, value in self.pending.items()
+            if key[0] in rows and key[1] in columns
+        }
+        self.scene_name = scene.name
+        self.dirty = False
+
+    def is_linked(self, row, column):
+        return column in self.cells.get(row, ())
+
+    def state(self, row, column):
+        return self.pending.get((row, column), self.is_linked(row, column))
+
+    def toggle(self, row, column):
+        target = not self.state(row, column)
+        if target == self.is_linked(row, column):
+            self.pending.pop((row, column), None)
+        else:
+            self.pending[(row, column)] = target
+
+_link_matrix = LinkMatrix()
+
+def mark_matrix_dirty(self=None, context=None):
+    _link_matrix.dirty = True
+
+def get_link_matrix(scene):
+    if _link_matrix.dirty or _link_matrix.scene_name != scene.name:
+        _link_matrix.rebuild(scene)
+    return _link_matrix
+
+def commit_matrix_edits(context, matrix):
+    # Collapse all pending cell edits into one link set and one unlink set per light.
+    per_light = {}
+    for (row, column), target in matrix.pending.items():
+        to_link, to_unlink = per_light.setdefault(row, (set(), set()))
+        (to_link if target else to_unlink).update(matrix.members.get(column, ()))
+    result = apply_light_edits(context, per_light)
+    matrix.pending.clear()
+    return result
+
+def apply_light_edits(context, per_light, journal=True):
+    # per_light: light name -> (receiver names to link, receiver names to unlink).
+    # Only the difference to each linking group's current members is touched.
+    lights = [bpy.data.objects.get(light_name) for light_name in per_light]
+    lights, failures = make_lights_editable(context, [light for light in lights if light])
+    linked_total = unlinked_total = 0
+    # Journaled like journal_link_results: receivers the light ends up linked to
+    # (already present or newly linked) and the ones actually gone, never failures.
+    edits = []
+    group_users = receiver_collection_users()
+    for light in lights:
+        to_link, to_unlink = per_light.get(light.name, (set(), set()))
+        group = get_linking_group(light)
+        if group and group_users[group] > 1:
+            # Editing it would change every light using it (e.g. a light group's members).
+            failures.append((light.name, f"receiver collection '{group.name}' is shared with other lights"))
+            continue
+        if to_link and not group:
+            group = ensure_linking_group(light)
+        if not group:
+            continue
+        if id_edit_state(group) != 'EDITABLE':
+            failures.append((light.name, f"linking group '{group.name}' comes from a library"))
+            continue
+        # Resolved through the collection itself: a name can match another (linked) object.
+        current = {obj.name: obj for obj in group.objects}
+        linked = to_link & current.keys()
+        for name in to_link - current:
+            obj = bpy.data.objects.get(name)
+            if not obj:
+                continue
+            try:
+                group.objects.link(obj)
+                linked.add(name)
+                linked_total += 1
+            except RuntimeError as e:
+                failures.append((f"{light.name} -> {name}", str(e)))
+        unlinked = (to_unlink - to_link) - current.keys()
+        for name in (to_unlink - to_link) & current.keys():
+            try:
+                group.objects.unlink(current[name])
+            except RuntimeError as e:
+                failures.append((f"{light.name} -> {name}", str(e)))
+                continue
+            unlinked.add(name)
+            unlinked_total += 1
+        if not group.objects and not group.children:
+            # Like Unlink: an empty receiver collection would leave the light lighting nothing.
+            try:
+                light.light_linking.receiver_collection = None
+            except (AttributeError, RuntimeError) as e:
+                failures.append((light.name, str(e)))
+        edits.append(('LINK', [light.name], sorted(linked)))
+        edits.append(('UNLINK', [light.name], sorted(unlinked)))
+    links_changed()
+    if journal:
+        journal_edits(edits)
+    return linked_total, unlinked_total, failures
+
+class LL_OT_MatrixToggle(bpy.types.Operator):
+    bl_idname = "light_link.matrix_toggle"
+    bl_label = "Toggle Link"
+    bl_description = "Stage a link change for this light and receiver. Use Apply to commit staged changes"
+
+    row: bpy.props.StringProperty()
+    column: bpy.props.StringProperty()
+
+    def execute(self, context):
+        get_link_matrix(context.scene).toggle(self.row, self.column)
+        request_redraw()
+        return {'FINISHED'}
+
+class LL_OT_MatrixApply(bpy.types.Operator):
+    bl_idname = "light_link.matrix_apply"
+    bl_label = "Apply Matrix Edits"
+    bl_description = "Commit all staged link matrix changes in one pass"
+
+    def execute(self, context):
+        matrix = get_link_matrix(context.scene)
+        if not matrix.pending:
+            self.report({'INFO'}, "No staged matrix changes")
+            return {'CANCELLED'}
+        try:
+            linked, unlinked, failures = commit_matrix_edits(context, matrix)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error applying matrix edits: {str(e)}")
+            return {'CANCELLED'}
+        request_redraw()
+        report_link_failures(self, failures)
+        self.report({'INFO'}, f"Linked {linked} and unlinked {unlinked} receiver(s)")
+        return {'FINISHED'}
+
+class LL_OT_MatrixRefresh(bpy.types.Operator):
+    bl_idname = "light_link.matrix_refresh"
+    bl_label = "Refresh Matrix"
+    bl_description = "Discard staged changes and re-read the matrix from the linking collections"
+
+    def execute(self, context):
+        _link_matrix.pending.clear()
+        _link_matrix.rebuild(context.scene)
+        request_redraw()
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Link Journal (append-only record of Link/Unlink, replayable)
+# -------------------------------------------------------------------
+# One JSON line per operation: ["+" or "-", [light names], [receiver names]].
+# Names rather than pointers, so a journal can be replayed onto a republished
+# version of the shot. Kept in a hidden text datablock and optionally in a
+# sidecar file next to the .blend.
+JOURNAL_TEXT = ".light_link_journal"
+JOURNAL_HEADER = "# light link journal v1"
+JOURNAL_EXT = ".lljournal"
+
+def journal_sidecar_path():
+    if not bpy.data.filepath:
+        return None
+    return os.path.splitext(bpy.data.filepath)[0] + JOURNAL_EXT
+
+def append_journal_lines(lines):
+    text = bpy.data.texts.get(JOURNAL_TEXT)
+    if text is None:
+        text = bpy.data.texts.new(JOURNAL_TEXT)
+        text.use_fake_user = True
+        text.write(JOURNAL_HEADER + "\n")
+    # Appending at the end keeps this O(entry) instead of rewriting the whole text.
+    text.cursor_set(len(text.lines) - 1, character=len(text.lines[-1].body))
+    text.write("".join(line + "\n" for line in lines))
+    if bpy.context.scene.ll_journal_sidecar:
+        path = journal_sidecar_path()
+        if path:
+            new_file = not os.path.exists(path)
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    if new_file:
+                        f.write(JOURNAL_HEADER + "\n")
+                    f.write("".join(line + "\n" for line in lines))
+            except OSError as e:
+                print(f"Light Link: could not append to journal {path}: {e}")
+
+def journal_edits(edits):
+    # edits: [(operation, light names, receiver names)], appended in one write.
+    if not bpy.context.scene.ll_journal_enabled:
+        return
+    lines = [
+        json.dumps(["+" if operation == 'LINK' else "-", list(lights), list(receivers)], separators=(",", ":"))
+        for operation, lights, receivers in edits if lights and receivers
+    ]
+    if lines:
+        append_journal_lines(lines)
+
+def journal_entry(operation, lights, receivers):
+    journal_edits([(operation, [light.name for light in lights], [obj.name for obj in receivers])])
+
+def journal_link_results(results, receivers):
+    # Lights that got every receiver share one entry; the rest record what they got.
+    journal_entry('LINK', [light for light, linked in results if len(linked) == len(receivers)], receivers)
+    for light, linked in results:
+        if len(linked) != len(receivers):
+            journal_entry('LINK', [light], linked)
+
+def parse_journal(lines):
+    entries = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            operation, lights, receivers = json.loads(line)
+        except (ValueError, TypeError):
+            print(f"Light Link: skipping malformed journal line {number}")
+            continue
+        if operation in ("+", "-"):
+            entries.append((operation, lights, receivers))
+    return entries
+
+def fold_journal(entries):
+    # Net effect per light: later entries override earlier ones for the same receiver.
+    per_light = {}
+    for operation, lights, receivers in entries:
+        for light_name in lights:
+            to_link, to_unlink = per_light.setdefault(light_name, (set(), set()))
+            if operation == "+":
+                to_link.update(receivers)
+                to_unlink.difference_update(receivers)
+            else:
+                to_unlink.update(receivers)
+                to_link.difference_update(receivers)
+    return per_light
+
+class LL_OT_ReplayJournal(bpy.types.Operator):
+    bl_idname = "light_link.replay_journal"
+    bl_label = "Replay Link Journal"
+    bl_description = (
+        "Apply a link journal (this file's, or a sidecar file from another version of the shot) "
+        "in one batched pass. Links that already exist are skipped"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: bpy.props.EnumProperty(
+        items=[
+            ('TEXT', "This File", "Replay the journal stored in this file"),
+            ('FILE', "Journal File", "Replay a sidecar journal file"),
+        ],
+        default='TEXT',
+    )
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*" + JOURNAL_EXT, options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if self.source == 'FILE':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def execute(self, context):
+        if self.source == 'FILE':
+            try:
+                with open(bpy.path.abspath(self.filepath), encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except OSError as e:
+                self.report({'ERROR'}, f"Could not read journal: {str(e)}")
+                return {'CANCELLED'}
+        else:
+            text = bpy.data.texts.get(JOURNAL_TEXT)
+            lines = text.as_string().splitlines() if text else []
+        entries = parse_journal(lines)
+        if not entries:
+            self.report({'WARNING'}, "Journal is empty")
+            return {'CANCELLED'}
+        per_light = fold_journal(entries)
+        missing = sum(1 for light_name in per_light if light_name not in bpy.data.objects)
+        # Replaying this file's own journal must not append it to itself again; a
+        # sidecar's entries are carried over as they were applied here.
+        linked, unlinked, failures = apply_light_edits(context, per_light, journal=self.source == 'FILE')
+        request_redraw()
+        report_link_failures(self, failures)
+        self.report({'INFO'}, (
+            f"Replayed {len(entries)} entr{'y' if len(entries) == 1 else 'ies'}: linked {linked}, unlinked {unlinked}"
+            + (f", {missing} light(s) not in this file" if missing else "")
+        ))
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Render-Cost Analysis of the Link Configuration
+# -------------------------------------------------------------------
+REPORT_TEXT = "Light Link Report"
+# Cycles stores light and shadow linking membership in 64-bit masks.
+MAX_LINK_SETS = 64
+LARGE_RECEIVER_SET = 10000
+
+def analyze_link_index(index):
+    receiver_usage = Counter()
+    for entry in index.values():
+        receiver_usage.update(entry.receivers)
+    receiver_sets = {entry.receivers for entry in index.values() if entry.receivers}
+    blocker_sets = {entry.blockers for entry in index.values() if entry.blockers}
+    collections = {entry.receiver_collection for entry in index.values() if entry.receiver_collection}
+    collections |= {entry.blocker_collection for entry in index.values() if entry.blocker_collection}
+
+    lights = []
+    for name, entry in sorted(index.items(), key=lambda item: -len(item[1].receivers)):
+        lights.append({
+            "light": name,
+            "receivers": len(entry.receivers),
+            "blockers": len(entry.blockers),
+            "receiver_collection": entry.receiver_collection,
+            "blocker_collection": entry.blocker_collection,
+            "shared_receivers": sum(1 for obj in entry.receivers if receiver_usage[obj] > 1),
+        })
+
+    warnings = []
+    if len(receiver_sets) > MAX_LINK_SETS:
+        warnings.append(f"{len(receiver_sets)} unique receiver sets exceed the {MAX_LINK_SETS} light sets Cycles supports")
+    if len(blocker_sets) > MAX_LINK_SETS:
+        warnings.append(f"{len(blocker_sets)} unique blocker sets exceed the {MAX_LINK_SETS} shadow sets Cycles supports")
+    for light in lights:
+        if light["receivers"] > LARGE_RECEIVER_SET:
+            warnings.append(f"{light['light']} has a very large receiver list ({light['receivers']} objects)")
+    # Identical receiver sets kept in separate collections could share one collection.
+    by_set = {}
+    for entry in index.values():
+        if entry.receivers:
+            by_set.setdefault(entry.receivers, set()).add(entry.receiver_collection)
+    duplicated = sum(len(colls) - 1 for colls in by_set.values() if len(colls) > 1)
+    if duplicated:
+        warnings.append(f"{duplicated} receiver collection(s) duplicate another light's receivers; consider a light group")
+
+    return {
+        "file": bpy.data.filepath,
+        "linked_lights": len(index),
+        "unique_receiver_sets": len(receiver_sets),
+        "unique_blocker_sets": len(blocker_sets),
+        "distinct_collections": len(collections),
+        "objects_linked_to_several_lights": sum(1 for count in receiver_usage.values() if count > 1),
+        "max_lights_per_object": max(receiver_usage.values(), default=0),
+        "lights": lights,
+        "warnings": warnings,
+    }
+
+def format_link_report(report):
+    lines = [
+        f"Light Link report for {report['file'] or '<unsaved file>'}",
+        f"Linked lights: {report['linked_lights']}",
+        f"Unique receiver sets: {report['unique_receiver_sets']} / blocker sets: {report['unique_blocker_sets']}",
+        f"Distinct linking collections: {report['distinct_collections']}",
+        f"Objects linked to several lights: {report['objects_linked_to_several_lights']} "
+        f"(max {report['max_lights_per_object']} lights per object)",
+        "",
+    ]
+    lines += [f"WARNING: {warning}" for warning in report["warnings"]]
+    lines.append("")
+    lines.append("Light | receivers | blockers | shared receivers | collection")
+    for light in report["lights"]:
+        lines.append(
+            f"{light['light']} | {light['receivers']} | {light['blockers']} | "
+            f"{light['shared_receivers']} | {light['receiver_collection']}"
+        )
+    return "\n".join(lines)
+
+class LL_OT_ExportSnapshot(bpy.types.Operator):
+    bl_idname = "light_link.export_snapshot"
+    bl_label = "Export Link Snapshot"
+    bl_description = (
+        "Write the light -> receiver/blocker topology to a snapshot file that light_link_diff.py "
+        "can compare against another snapshot or .blend file"
+    )
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.llsnap", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = os.path.splitext(bpy.data.filepath or "untitled.blend")[0] + ".llsnap"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        get_link_index()
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".llsnap")
+        try:
+            with open(path, "w", encoding="ascii") as f:
+                f.write(encode_link_snapshot(*_link_index))
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write snapshot: {str(e)}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported links of {len(_link_index[1])} light(s) to {path}")
+        return {'FINISHED'}
+
+class LL_OT_AnalyzeLinks(bpy.types.Operator):
+    bl_idname = "light_link.analyze_links"
+    bl_label = "Analyze Light Links"
+    bl_description = (
+        "Summarise receivers, blockers, shared receivers and unique link sets per light, flag "
+        "configurations likely to be expensive to render, and write the report to a text datablock"
+    )
+
+    filepath: bpy.props.StringProperty(
+        name="JSON Report",
+        description="Optional path of a JSON file to also write the report to",
+        subtype='FILE_PATH',
+    )
+
+    def execute(self, context):
+        report = analyze_link_index(get_link_index())
+        text = bpy.data.texts.get(REPORT_TEXT) or bpy.data.texts.new(REPORT_TEXT)
+        text.from_string(format_link_report(report))
+        if self.filepath:
+            path = bpy.path.abspath(self.filepath)
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=1)
+            except OSError as e:
+                self.report({'ERROR'}, f"Could not write report: {str(e)}")
+                return {'CANCELLED'}
+        level = {'WARNING'} if report["warnings"] else {'INFO'}
+        self.report(level, (
+            f"{report['linked_lights']} linked light(s), {report['unique_receiver_sets']} unique receiver set(s), "
+            f"{len(report['warnings'])} warning(s); see text '{REPORT_TEXT}'"
+        ))
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Garbage Collection of Orphaned Linking Collections
+# -------------------------------------------------------------------
+def find_orphan_linking_collections():
+    referenced = set()
+    for obj in bpy.data.objects:
+        linking = obj.light_linking
+        if linking.receiver_collection:
+            referenced.add(linking.receiver_collection)
+        if linking.blocker_collection:
+            referenced.add(linking.blocker_collection)
+    for scene in bpy.data.scenes:
+        referenced.update(group.receiver_collection for group in scene.ll_light_groups if group.receiver_collection)
+    # A collection that sits in a scene or under another collection is part of
+    # the user's hierarchy, whatever its tag says.
+    placed = placed_collections()
+    return [
+        coll for coll in bpy.data.collections
+        if coll.library is None and coll not in referenced and coll not in placed and is_linking_collection(coll)
+    ]
+
+def collect_linking_garbage(mode='REMOVE'):
+    orphans = find_orphan_linking_collections()
+    member_links = sum(len(coll.objects) + len(coll.children) for coll in orphans)
+    if not orphans:
+        return 0, 0
+    if mode == 'REMOVE':
+        bpy.data.batch_remove(ids=orphans)
+        invalidate_linking_registry()
+        # Scope indexes and search indexes still point at the removed collections.
+        invalidate_scope_indexes()
+        _search_indexes.clear()
+    else:
+        for coll in orphans:
+            for obj in list(coll.objects):
+                coll.objects.unlink(obj)
+            for child in list(coll.children):
+                coll.children.unlink(child)
+    links_changed()
+    return len(orphans), member_links
+
+class LL_OT_CollectGarbage(bpy.types.Operator):
+    bl_idname = "light_link.collect_garbage"
+    bl_label = "Clean Up Linking Collections"
+    bl_description = (
+        "Empty or remove light linking collections that no light, blocker or light group references "
+        "anymore and that are not part of any scene or collection hierarchy"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: bpy.props.EnumProperty(
+        items=[
+            ('REMOVE', "Remove", "Delete the orphaned collections"),
+            ('EMPTY', "Empty", "Keep the orphaned collections but unlink everything from them"),
+        ],
+        default='REMOVE',
+    )
+
+    def execute(self, context):
+        count, member_links = collect_linking_garbage(self.mode)
+        if not count:
+            self.report({'INFO'}, "No orphaned linking collections found")
+            return {'FINISHED'}
+        action = "Removed" if self.mode == 'REMOVE' else "Emptied"
+        self.report({'INFO'}, f"{action} {count} orphaned linking collection(s), dropping {member_links} member link(s)")
+        return {'FINISHED'}
+
+# File size of the previous save, recorded when the scene cleans up on save.
+_gc_save_state = {}
+
+@persistent
+def ll_save_pre(dummy):
+    scene = bpy.context.scene
+    if not scene:
+        return
+    if scene.ll_gc_on_save:
+        count, member_links = collect_linking_garbage('REMOVE')
+        if count and bpy.data.filepath and os.path.exists(bpy.data.filepath):
+            _gc_save_state["size"] = os.path.getsize(bpy.data.filepath)
+            _gc_save_state["count"] = count
+            _gc_save_state["links"] = member_links
+    if scene.ll_snapshot_on_save:
+        write_link_snapshot()
+
+@persistent
+def ll_save_post(dummy):
+    if "size" not in _gc_save_state or not os.path.exists(bpy.data.filepath):
+        _gc_save_state.clear()
+        return
+    before = _gc_save_state.pop("size")
+    reclaimed = before - os.path.getsize(bpy.data.filepath)
+    print(
+        f"Light Link: removed {_gc_save_state.pop('count')} orphaned linking collection(s) "
+        f"({_gc_save_state.pop('links')} member link(s)) on save; file size changed by {-reclaimed} bytes"
+    )
+
+# -------------------------------------------------------------------
+#   Fuzzy Finder (trigram + prefix index over names)
+# -------------------------------------------------------------------
+def name_trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """Trigram postings for fuzzy matching plus a sorted name list for short prefix queries."""
+
+    def __init__(self):
+        self.source = None
+        self.items = []
+        self.names = []
+        self.grams = {}
+        self.prefix = []
+
+    def build(self, source, items):
+        self.source = source
+        self.items = list(items)
+        self.names = []
+        self.grams = {}
+        self.prefix = []
+        for pos, item in enumerate(self.items):
+            name = item.name.lower()
+            self.names.append(name)
+            self._add(pos, name)
+        self.prefix.sort()
+
+    def _add(self, pos, name):
+        for gram in name_trigrams(name):
+            self.grams.setdefault(gram, set()).add(pos)
+        self.prefix.append((name, pos))
+
+    def _remove(self, pos, name):
+        for gram in name_trigrams(name):
+            postings = self.grams.get(gram)
+            if postings:
+                postings.discard(pos)
+        i = bisect_left(self.prefix, (name, pos))
+        if i < len(self.prefix) and self.prefix[i] == (name, pos):
+            del self.prefix[i]
+
+    def sync_names(self):
+        # Re-index only the entries whose name changed since the last search.
+        changed = 0
+        for pos, item in enumerate(self.items):
+            try:
+                name = item.name.lower()
+            except ReferenceError:
+                continue
+            old = self.names[pos]
+            if name == old:
+                continue
+            self._remove(pos, old)
+            self.names[pos] = name
+            for gram in name_trigrams(name):
+                self.grams.setdefault(gram, set()).add(pos)
+            insort(self.prefix, (name, pos))
+            changed += 1
+        return changed
+
+    def search(self, query, limit=20):
+        query = query.lower().strip()
+        if not query:
+            return []
+        if len(query) < 3:
+            result = []
+            i = bisect_left(self.prefix, (query,))
+            while i < len(self.prefix) and len(result) < limit:
+                name, pos = self.prefix[i]
+                if not name.startswith(query):
+                    break
+                result.append(self.items[pos])
+                i += 1
+            return result
+        query_grams = name_trigrams(query)
+        counts = Counter()
+        for gram in query_grams:
+            postings = self.grams.get(gram)
+            if postings:
+                counts.update(postings)
+        needed = max(1, len(query_grams) // 2)
+        ranked = heapq.nsmallest(
+            limit,
+            ((-count, query not in self.names[pos], len(self.names[pos]), pos)
+             for pos, count in counts.items() if count >= needed),
+        )
+        return [self.items[entry[3]] for entry in ranked]
+
+_search_indexes = {}
+_search_names_dirty = False
+_msgbus_owner = object()
+
+def on_name_changed(*args):
+    global _search_names_dirty
+    _search_names_dirty = True
+    invalidate_link_index()
+
+def subscribe_name_changes():
+    for id_type in (bpy.types.Object, bpy.types.Collection):
+        bpy.msgbus.subscribe_rna(key=(id_type, "name"), owner=_msgbus_owner, args=(), notify=on_name_changed)
+
+def get_search_index(scene, context, kind):
+    global _search_names_dirty
+    scope_index = get_scope_index(scene, context)
+    if kind == 'LIGHTS':
+        source = get_light_sources(scene, scope_index)
+    elif kind == 'MESHES':
+        source = scope_index.meshes
+    else:
+        source = scope_index.collections
+    index = _search_indexes.setdefault(kind, TrigramIndex())
+    if index.source is not source:
+        if kind == 'COLLECTIONS':
+            linking_collections = get_linking_registry()
+            index.build(source, (coll for coll in source if coll not in linking_collections))
+        else:
+            index.build(source, source)
+    elif _search_names_dirty:
+        for other in _search_indexes.values():
+            other.sync_names()
+        _search_names_dirty = False
+    return index
+
+SEARCH_LISTS = {
+    'LIGHTS': ("ll_light_items", "ll_light_index", "obj"),
+    'MESHES': ("ll_mesh_items", "ll_mesh_index", "obj"),
+    'COLLECTIONS': ("ll_collection_items", "ll_collection_index", "coll"),
+}
+
+SEARCH_KIND_ITEMS = [
+    ('LIGHTS', "Lights", ""),
+    ('MESHES', "Meshes", ""),
+    ('COLLECTIONS', "Collections", ""),
+]
+
+class LL_OT_FuzzyFind(bpy.types.Operator):
+    bl_idname = "light_link.fuzzy_find"
+    bl_label = "Find"
+    bl_description = "Search lights, meshes or collections by name as you type and tick the picked one in its list"
+
+    kind: bpy.props.EnumProperty(items=SEARCH_KIND_ITEMS)
+
+    def invoke(self, context, event):
+        context.scene.ll_search_kind = self.kind
+        return context.window_manager.invoke_popup(self, width=360)
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        layout.row().prop(scene, "ll_search_kind", expand=True)
+        layout.prop(scene, "ll_search_query", text="", icon='VIEWZOOM')
+        index = get_search_index(scene, context, scene.ll_search_kind)
+        results = index.search(scene.ll_search_query)
+        if scene.ll_search_query and not results:
+            layout.label(text="No matches")
+        col = layout.column(align=True)
+        for item in results:
+            op = col.operator("light_link.search_pick", text=item.name, emboss=False)
+            op.kind = scene.ll_search_kind
+            op.name = item.name
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+class LL_OT_SearchPick(bpy.types.Operator):
+    bl_idname = "light_link.search_pick"
+    bl_label = "Pick Search Result"
+    bl_description = "Tick this item in its list and make it the active row"
+
+    kind: bpy.props.EnumProperty(items=SEARCH_KIND_ITEMS)
+    name: bpy.props.StringProperty()
+
+    def execute(self, context):
+        scene = context.scene
+        items_prop, index_prop, pointer_prop = SEARCH_LISTS[self.kind]
+        items = getattr(scene, items_prop)
+        row = find_list_row(items, items_prop, self.name)
+        if row is None:
+            # The list is filtered; add the found item back to it.
+            data = bpy.data.collections if self.kind == 'COLLECTIONS' else bpy.data.objects
+            id_data = data.get(self.name)
+            if not id_data:
+                self.report({'WARNING'}, f"{self.name} no longer exists")
+                return {'CANCELLED'}
+            setattr(items.add(), pointer_prop, id_data)
+            row = len(items) - 1
+        set_row_selected(scene, items_prop, row, True)
+        setattr(scene, index_prop, row)
+        request_redraw()
+        return {'FINISHED'}
+
+# -------------------------------------------------------------------
+#   Live Selection Sync (viewport/outliner <-> list rows)
+# -------------------------------------------------------------------
+SYNC_DELAY = 0.1
+SYNCED_LISTS = ("ll_light_items", "ll_mesh_items")
+# Emissive meshes can have a row in the Lights list as well as the Meshes list.
+SYNC_LISTS = {'LIGHT': ("ll_light_items",), 'MESH': ("ll_mesh_items", "ll_light_items")}
+
+class SelectionSync:
+    def __init__(self):
+        # Selected object name -> list property it belongs to, as of the last sync.
+        self.last_selection = {}
+        self.rows = {}
+        self.pending = False
+        self.applying = False
+
+_selection_sync = SelectionSync()
+
+def row_name(item, pointer_prop):
+    id_data = getattr(item, pointer_prop)
+    return id_data.name if id_data else ""
+
+def find_list_row(items, items_prop, name):
+    # Cached name -> row map, rebuilt only when the list length changed or a row moved.
+    pointer_prop = LIST_POINTERS[items_prop]
+    rows = _selection_sync.rows.get(items_prop)
+    if rows is None or len(rows) != len(items):
+        rows = _selection_sync.rows[items_prop] = {row_name(item, pointer_prop): i for i, item in enumerate(items)}
+    row = rows.get(name)
+    if row is not None and (row >= len(items) or row_name(items[row], pointer_prop) != name):
+        rows = _selection_sync.rows[items_prop] = {row_name(item, pointer_prop): i for i, item in enumerate(items)}
+        row = rows.get(name)
+    return row
+
+def schedule_selection_sync():
+    state = _selection_sync
+    if state.pending or state.applying:
+        return
+    state.pending = True
+    bpy.app.timers.register(sync_selection_from_viewport, first_interval=SYNC_DELAY)
+
+def sync_selection_from_viewport():
+    state = _selection_sync
+    state.pending = False
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    if not scene or not view_layer or not scene.ll_sync_selection:
+        return None
+    current = {obj.name: SYNC_LISTS[obj.type] for obj in view_layer.objects.selected if obj.type in SYNC_LISTS}
+    previous = state.last_selection
+    state.last_selection = current
+    changes = [(name, props, True) for name, props in current.items() if name not in previous]
+    changes += [(name, props, False) for name, props in previous.items() if name not in current]
+    if not changes:
+        return None
+    state.applying = True
+    try:
+        # One bitset update per list, however many objects changed.
+        for items_prop in SYNCED_LISTS:
+            items = getattr(scene, items_prop)
+            bits = bytearray(get_selection_bits(scene, items_prop))
+            for name, props, value in changes:
+                if items_prop not in props:
+                    continue
+                row = find_list_row(items, items_prop, name)
+                if row is not None:
+                    set_row_bit(bits, row, value)
+            replace_selection(scene, items_prop, bits)
+    finally:
+        state.applying = False
+    request_redraw()
+    return None
+
+def push_selection_to_viewport(scene, items_prop, changed, bits):
+    state = _selection_sync
+    if state.applying or not scene.ll_sync_selection or items_prop not in SYNCED_LISTS:
+        return
+    items = getattr(scene, items_prop)
+    for row in selected_rows(changed):
+        if row >= len(items):
+            break
+        obj = items[row].obj
+        if obj is None or obj.type not in SYNC_LISTS:
+            continue
+        value = is_row_selected(bits, row)
+        try:
+            if obj.select_get() == value:
+                continue
+            obj.select_set(value)
+        except RuntimeError:
+            continue  # Not in the active view layer.
+        # Record the change so the depsgraph update it causes is not synced back.
+        if value:
+            state.last_selection[obj.name] = SYNC_LISTS[obj.type]
+        else:
+            state.last_selection.pop(obj.name, None)
+
+def update_sync_selection(scene, context):
+    _selection_sync.last_selection = {}
+    _selection_sync.rows = {}
+    if scene.ll_sync_selection:
+        schedule_selection_sync()
+
+# -------------------------------------------------------------------
+#   Undo/Redo-Safe Pointer Caches (remapped by session UID)
+# -------------------------------------------------------------------
+# Undo frees and reallocates IDs, so cached Object/Collection references
+# must not survive a step. Before the step every pointer cache is frozen
+# into session UIDs (stable across undo); afterwards they are resolved
+# again in one pass over bpy.data. The list rows' PointerProperties are
+# file data and are restored by undo itself.
+_undo_state = None
+
+def membership_fingerprint():
+    # Covers everything the pointer caches are derived from: ID counts,
+    # collection contents and which objects each view layer sees.
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{len(bpy.data.objects)}:{len(bpy.data.collections)}".encode())
+    for coll in bpy.data.collections:
+        digest.update(f"|{len(coll.objects)}:{len(coll.children)}".encode())
+    for scene in bpy.data.scenes:
+        for view_layer in scene.view_layers:
+            digest.update(f"|{len(view_layer.objects)}".encode())
+    return digest.hexdigest()
+
+def freeze_pointer_caches():
+    def uids(ids):
+        return tuple(id_data.session_uid for id_data in ids)
+
+    scopes = {key: index.session_uids() for key, index in _scope_indexes.items()}
+    subtrees = {
+        coll.session_uid: (uids(objects), uids(descendants))
+        for coll, (objects, descendants) in _subtree_memo.items()
+    }
+    registry = None if _linking_registry is None else uids(_linking_registry)
+    searches = {}
+    for kind, index in _search_indexes.items():
+        # Remember which scope list the index was built from so it stays current.
+        source = next(
+            ((key, attr) for key, scope_index in _scope_indexes.items()
+             for attr in ("lights", "meshes", "collections")
+             if getattr(scope_index, attr) is index.source),
+            None,
+        )
+        searches[kind] = (source, uids(index.items))
+    return membership_fingerprint(), scopes, subtrees, registry, searches
+
+def drop_pointer_caches():
+    global _linking_registry
+    invalidate_scope_indexes()
+    _linking_registry = None
+    _search_indexes.clear()
+
+def thaw_pointer_caches(state):
+    global _linking_registry, _search_names_dirty
+    fingerprint, scopes, subtrees, registry, searches = state
+    if fingerprint != membership_fingerprint():
+        # The step added, removed or moved objects: rebuild lazily instead.
+        drop_pointer_caches()
+        return False
+    resolve = {id_data.session_uid: id_data for id_data in bpy.data.objects}
+    resolve.update((coll.session_uid, coll) for coll in bpy.data.collections)
+    try:
+        new_scopes = {key: ScopeIndex.from_session_uids(uids, resolve) for key, uids in scopes.items()}
+        new_subtrees = {
+            resolve[uid]: (frozenset(resolve[u] for u in objects), frozenset(resolve[u] for u in descendants))
+            for uid, (objects, descendants) in subtrees.items()
+        }
+        new_registry = None if registry is None else {resolve[uid] for uid in registry}
+        for kind, (source, uids) in searches.items():
+            index = _search_indexes[kind]
+            index.items = [resolve[uid] for uid in uids]
+            index.source = getattr(new_scopes[source[0]], source[1]) if source else None
+    except KeyError:
+        drop_pointer_caches()
+        return False
+    _scope_indexes.clear()
+    _scope_indexes.update(new_scopes)
+    _subtree_memo.clear()
+    _subtree_memo.update(new_subtrees)
+    _linking_registry = new_registry
+    # Undo may have reverted renames; let the search indexes pick them up.
+    _search_names_dirty = True
+    return True
+
+@persistent
+def ll_undo_pre(dummy):
+    global _undo_state
+    # Queued jobs hold pointers into the current undo step.
+    if _scheduler.queue:
+        _scheduler.cancel_all()
+    try:
+        _undo_state = freeze_pointer_caches()
+    except ReferenceError:
+        _undo_state = None
+
+@persistent
+def ll_undo_post(dummy):
+    global _undo_state
+    state, _undo_state = _undo_state, None
+    if state is None:
+        drop_pointer_caches()
+    else:
+        thaw_pointer_caches(state)
+    # Undoing a material edit sends no depsgraph update for it.
+    _emission_cache.clear()
+    # Name-keyed caches only need revalidating.
+    invalidate_link_index()
+    mark_matrix_dirty()
+    _selection_sync.rows = {}
+
+# -------------------------------------------------------------------
+#   UIList Classes for Scrollable Lists
+# -------------------------------------------------------------------
+class PointerRowList:
+    # Rows only hold a pointer: the name and the tick are looked up while drawing.
+    items_prop = ""
+    item_type = ""
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        self.use_filter_show = True
+        row = layout.row(align=True)
+        ticked = is_row_selected(get_selection_bits(data, self.items_prop), index)
+        op = row.operator("light_link.toggle_selection", text="", emboss=False,
+                          icon='CHECKBOX_HLT' if ticked else 'CHECKBOX_DEHLT')
+        op.item_type = self.item_type
+        op.index = index
+        row.label(text=row_name(item, LIST_POINTERS[self.items_prop]))
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        pointer_prop = LIST_POINTERS[self.items_prop]
+        flags = []
+        orders = []
+        if self.filter_name or self.use_filter_sort_alpha:
+            names = [row_name(item, pointer_prop).lower() for item in items]
+            if self.filter_name:
+                pattern = self.filter_name.lower()
+                flags = [self.bitflag_filter_item if pattern in name else 0 for name in names]
+            if self.use_filter_sort_alpha:
+                orders = [0] * len(names)
+                for order, row in enumerate(sorted(range(len(names)), key=names.__getitem__)):
+                    orders[row] = order
+        return flags, orders
+
+class LL_UL_LightList_UI(PointerRowList, bpy.types.UIList):
+    items_prop = "ll_light_items"
+    item_type = 'LIGHT'
+
+class LL_UL_MeshList_UI(PointerRowList, bpy.types.UIList):
+    items_prop = "ll_mesh_items"
+    item_type = 'MESH'
+
+class LL_UL_CollectionList_UI(PointerRowList, bpy.types.UIList):
+    items_prop = "ll_collection_items"
+    item_type = 'COLLECTION'
+
+class LL_UL_LightGroupList_UI(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "name", text="", emboss=False, icon='LIGHT')
+        row.label(text=str(len(item.lights)))
+
+# -------------------------------------------------------------------
+#   Panels – a small parent panel with collapsible, poll-gated sections.
+#   Blender skips draw() for closed subpanels, so hidden sections cost nothing.
+# -------------------------------------------------------------------
+# (scene name, items property) -> ((selection string, row count), header text).
+_list_summaries = {}
+
+def list_summary(scene, items_prop):
+    # Ticked/total text for a section header; recounted only when the bitset or the list changed.
+    key = (scene.name, items_prop)
+    state = (getattr(scene, SELECTION_PROPS[items_prop]), len(getattr(scene, items_prop)))
+    cached = _list_summaries.get(key)
+    if cached is None or cached[0] != state:
+        bits = get_selection_bits(scene, items_prop)
+        ticked = sum(bin(byte).count("1") for byte in bits)
+        cached = _list_summaries[key] = (state, f"{ticked} / {state[1]}")
+    return cached[1]
+
+class LL_PT_Panel(bpy.types.Panel):
+    bl_label = "Light Link"
+    bl_idname = "LL_PT_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Light Link"
+    
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        layout.row().prop(scene, "ll_scope", expand=True)
+        row = layout.row(align=True)
+        row.prop(scene, "ll_list_rows", text="List Height")
+        row.prop(scene, "ll_sync_selection", text="Sync", icon='UV_SYNC_SELECT')
+
+        # Background job queue state.
+        if _scheduler.queue:
+            job_row = layout.row(align=True)
+            job = _scheduler.queue[0]
+            job_row.label(text=f"{job.label} {job.progress} ({len(_scheduler.queue)} queued)", icon='SORTTIME')
+            job_row.operator("light_link.cancel_jobs", text="", icon='X')
+        elif _scheduler.last_message:
+            layout.label(text=_scheduler.last_message, icon='CHECKMARK')
+
+class LightLinkSubPanel:
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Light Link"
+    bl_parent_id = "LL_PT_panel"
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None
+
+class ListSubPanel(LightLinkSubPanel):
+    list_type = ""
+    items_prop = ""
+    index_prop = ""
+    find_kind = ""
+
+    def draw_header(self, context):
+        self.layout.label(text=list_summary(context.scene, self.items_prop))
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        layout.template_list(self.list_type, "", scene, self.items_prop, scene, self.index_prop, rows=scene.ll_list_rows)
+        row = layout.row(align=True)
+        self.draw_list_ops(row)
+        row.operator("light_link.fuzzy_find", text="Find", icon='VIEWZOOM').kind = self.find_kind
+
+class LL_PT_Lights(ListSubPanel, bpy.types.Panel):
+    bl_label = "Lights"
+    bl_idname = "LL_PT_lights"
+    list_type = "LL_UL_LightList_UI"
+    items_prop = "ll_light_items"
+    index_prop = "ll_light_index"
+    find_kind = 'LIGHTS'
+
+    def draw_list_ops(self, row):
+        row.operator("light_link.refresh_selected_lights", text="Selected")
+        row.operator("light_link.refresh_all_lights", text="All")
+        row.operator("light_link.reset_lights", text="Reset")
+
+    def draw(self, context):
+        super().draw(context)
+        scene = context.scene
+        self.layout.prop(scene, "ll_include_emitters", icon='SHADING_RENDERED')
+        # Light groups: named sets of lights that can be linked as one target.
+        group_row = self.layout.row()
+        group_row.template_list("LL_UL_LightGroupList_UI", "", scene, "ll_light_groups", scene, "ll_light_group_index", rows=3)
+        group_ops = group_row.column(align=True)
+        group_ops.operator("light_link.light_group_add", text="", icon='ADD')
+        group_ops.operator("light_link.light_group_remove", text="", icon='REMOVE')
+        group_ops.operator("light_link.light_group_select", text="", icon='CHECKBOX_HLT')
+
+class LL_PT_Receivers(ListSubPanel, bpy.types.Panel):
+    bl_label = "Receivers"
+    bl_idname = "LL_PT_receivers"
+    list_type = "LL_UL_MeshList_UI"
+    items_prop = "ll_mesh_items"
+    index_prop = "ll_mesh_index"
+    find_kind = 'MESHES'
+
+    def draw_list_ops(self, row):
+        row.operator("light_link.refresh_selected_meshes", text="Selected")
+        row.operator("light_link.refresh_all_meshes", text="All")
+        row.operator("light_link.reset_meshes", text="Reset")
+
+class LL_PT_Collections(ListSubPanel, bpy.types.Panel):
+    bl_label = "Collections"
+    bl_idname = "LL_PT_collections"
+    bl_options = {'DEFAULT_CLOSED'}
+    list_type = "LL_UL_CollectionList_UI"
+    items_prop = "ll_collection_items"
+    index_prop = "ll_collection_index"
+    find_kind = 'COLLECTIONS'
+
+    def draw_list_ops(self, row):
+        row.operator("light_link.reset_collections", text="Reset")
+
+class LL_PT_LinkActions(LightLinkSubPanel, bpy.types.Panel):
+    bl_label = "Link Actions"
+    bl_idname = "LL_PT_link_actions"
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        target_row = layout.row()
+        target_row.prop(scene, "ll_link_target", expand=True)
+        target_row.prop(scene, "ll_include_children", text="Children")
+        link_row = layout.row(align=True)
+        link_row.operator("light_link.link", text="Link")
+        link_row.operator("light_link.unlink", text="Unlink")
+        set_row = layout.row(align=True)
+        for operation, label in (('COPY', "Copy"), ('UNION', "Union"), ('INTERSECT', "Intersect"), ('SUBTRACT', "Subtract")):
+            set_row.operator("light_link.link_set_op", text=label).operation = operation
+        preset_row = layout.row(align=True)
+        preset_row.operator("light_link.preset_apply", text="Apply Preset", icon='PRESET')
+        preset_row.operator("light_link.preset_save", text="", icon='ADD')
+        preset_row.operator("light_link.preset_remove", text="", icon='REMOVE')
+        journal_row = layout.row(align=True)
+        journal_row.prop(scene, "ll_journal_enabled", icon='TEXT')
+        journal_row.prop(scene, "ll_journal_sidecar")
+        journal_row.operator("light_link.replay_journal", text="Replay").source = 'TEXT'
+        journal_row.operator("light_link.replay_journal", text="", icon='FILEBROWSER').source = 'FILE'
+
+class LL_PT_LinkMatrix(LightLinkSubPanel, bpy.types.Panel):
+    bl_label = "Link Matrix"
+    bl_idname = "LL_PT_link_matrix"
+    bl_parent_id = "LL_PT_link_actions"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        # Nothing to tabulate until the Lights list has rows.
+        return context.scene is not None and len(context.scene.ll_light_items) > 0
+
+    def draw(self, context):
+        # Only the visible window of cells is drawn.
+        self.draw_matrix(self.layout, context.scene)
+
+    def draw_matrix(self, layout, scene):
+        matrix = get_link_matrix(scene)
+        layout.row().prop(scene, "ll_matrix_mode", expand=True)
+        nav = layout.row(align=True)
+        nav.prop(scene, "ll_matrix_row_offset", text="Row")
+        nav.prop(scene, "ll_matrix_col_offset", text="Column")
+        nav.prop(scene, "ll_matrix_columns", text="Width")
+        if not matrix.rows or not matrix.columns:
+            layout.label(text="No lights or receivers to show")
+            return
+
+        row_start = min(scene.ll_matrix_row_offset, len(matrix.rows) - 1)
+        col_start = min(scene.ll_matrix_col_offset, len(matrix.columns) - 1)
+        rows = matrix.rows[row_start:row_start + scene.ll_list_rows]
+        columns = matrix.columns[col_start:col_start + scene.ll_matrix_columns]
+
+        grid = layout.column(align=True)
+        head = grid.row(align=True)
+        head.label(text="")
+        for column in columns:
+            head.label(text=column[:8])
+        for light_name in rows:
+            line = grid.row(align=True)
+            line.label(text=light_name)
+            for column in columns:
+                staged = (light_name, column) in matrix.pending
+                on = matrix.state(light_name, column)
+                op = line.operator(
+                    "light_link.matrix_toggle", text="",
+                    icon='CHECKBOX_HLT' if on else 'CHECKBOX_DEHLT', depress=staged,
+                )
+                op.row = light_name
+                op.column = column
+
+        footer = layout.row(align=True)
+        footer.label(text=f"{len(matrix.rows)} x {len(matrix.columns)}, {len(matrix.pending)} staged")
+        footer.operator("light_link.matrix_refresh", text="", icon='FILE_REFRESH')
+        footer.operator("light_link.matrix_apply", text="Apply")
+
+class LL_PT_Diagnostics(LightLinkSubPanel, bpy.types.Panel):
+    bl_label = "Diagnostics"
+    bl_idname = "LL_PT_diagnostics"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        row = layout.row(align=True)
+        row.operator("light_link.isolate_light", text="Isolate Light", icon='HIDE_ON', depress=scene.ll_isolate_active)
+        row.operator("light_link.analyze_links", text="Analyze", icon='INFO')
+        row = layout.row(align=True)
+        row.operator("light_link.collect_garbage", text="Clean Up", icon='TRASH')
+        row.prop(scene, "ll_gc_on_save", text="On Save")
+        row = layout.row(align=True)
+        row.prop(scene, "ll_snapshot_on_save")
+        row.operator("light_link.export_snapshot", text="Export", icon='EXPORT')
 
 # -------------------------------------------------------------------
 #   Registration
@@ -456,7 +3147,10 @@ classes = (
     LL_LightItem,
     LL_MeshItem,
     LL_CollectionItem,
+    LL_LightGroupMember,
+    LL_LightGroup,
     LL_OT_ToggleSelection,
+    LL_OT_CancelJobs,
     LL_OT_RefreshSelectedLights,
     LL_OT_RefreshSelectedMeshes,
     LL_OT_RefreshSelectedCollections,
@@ -467,21 +3161,85 @@ classes = (
     LL_OT_ResetCollections,
     LL_OT_Link,
     LL_OT_Unlink,
+    LL_OT_LightGroupAdd,
+    LL_OT_LightGroupRemove,
+    LL_OT_LightGroupSelect,
+    LL_OT_LinkSetOp,
+    LL_OT_PresetSave,
+    LL_OT_PresetApply,
+    LL_OT_PresetRemove,
+    LL_OT_IsolateLight,
+    LL_OT_MatrixToggle,
+    LL_OT_MatrixApply,
+    LL_OT_MatrixRefresh,
+    LL_OT_ReplayJournal,
+    LL_OT_AnalyzeLinks,
+    LL_OT_ExportSnapshot,
+    LL_OT_CollectGarbage,
+    LL_OT_FuzzyFind,
+    LL_OT_SearchPick,
     LL_UL_LightList_UI,
     LL_UL_MeshList_UI,
     LL_UL_CollectionList_UI,
+    LL_UL_LightGroupList_UI,
     LL_PT_Panel,
+    LL_PT_Lights,
+    LL_PT_Receivers,
+    LL_PT_Collections,
+    LL_PT_LinkActions,
+    LL_PT_LinkMatrix,
+    LL_PT_Diagnostics,
+)
+
+app_handlers = (
+    ("load_post", ll_load_post),
+    ("undo_pre", ll_undo_pre),
+    ("redo_pre", ll_undo_pre),
+    ("undo_post", ll_undo_post),
+    ("redo_post", ll_undo_post),
+    ("save_pre", ll_save_pre),
+    ("save_post", ll_save_post),
+    ("depsgraph_update_post", ll_depsgraph_update_post),
 )
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.Collection.ll_linking_group = bpy.props.BoolProperty(
+        name="Light Linking Group",
+        description="Collection was created by Light Link as a light linking receiver collection",
+        default=False
+    )
+    bpy.types.Scene.ll_linking_tags_migrated = bpy.props.BoolProperty(default=False)
+    bpy.types.Scene.ll_snapshot_on_save = bpy.props.BoolProperty(
+        name="Save Link Snapshot",
+        description="Store a compact snapshot of the light link index in the file so it is not rebuilt on load",
+        default=True
+    )
     bpy.types.Scene.ll_light_items = bpy.props.CollectionProperty(type=LL_LightItem)
     bpy.types.Scene.ll_mesh_items = bpy.props.CollectionProperty(type=LL_MeshItem)
     bpy.types.Scene.ll_collection_items = bpy.props.CollectionProperty(type=LL_CollectionItem)
+    bpy.types.Scene.ll_light_selection = bpy.props.StringProperty(options={'HIDDEN'})
+    bpy.types.Scene.ll_mesh_selection = bpy.props.StringProperty(options={'HIDDEN'})
+    bpy.types.Scene.ll_collection_selection = bpy.props.StringProperty(options={'HIDDEN'})
     bpy.types.Scene.ll_light_index = bpy.props.IntProperty(default=-1)
     bpy.types.Scene.ll_mesh_index = bpy.props.IntProperty(default=-1)
     bpy.types.Scene.ll_collection_index = bpy.props.IntProperty(default=-1)
+    bpy.types.Scene.ll_light_groups = bpy.props.CollectionProperty(type=LL_LightGroup)
+    bpy.types.Scene.ll_light_group_index = bpy.props.IntProperty(default=-1)
+    bpy.types.Scene.ll_link_target = bpy.props.EnumProperty(
+        name="Link Target",
+        items=[
+            ('LIGHTS', "Ticked Lights", "Link/Unlink each ticked light through its own receiver collection"),
+            ('GROUP', "Light Group", "Link/Unlink all lights of the active light group through one shared receiver collection"),
+        ],
+        default='LIGHTS',
+    )
+    bpy.types.Scene.ll_include_children = bpy.props.BoolProperty(
+        name="Include Children",
+        description="Also link/unlink the child meshes of ticked meshes and of meshes in ticked collections",
+        default=False
+    )
     bpy.types.Scene.ll_list_rows = bpy.props.IntProperty(
         name="List Height",
         description="Number of rows to display in each list",
@@ -489,20 +3247,126 @@ def register():
         min=1,
         max=50
     )
+    bpy.types.Scene.ll_scope = bpy.props.EnumProperty(
+        name="Scope",
+        description="Which objects the lists and link operations work on",
+        items=[
+            ('VIEW_LAYER', "View Layer", "Objects and collections enabled in the active view layer"),
+            ('SCENE', "Scene", "All objects of the current scene"),
+            ('ALL_SCENES', "All Scenes", "Objects of every scene in the file"),
+        ],
+        default='SCENE',
+        update=update_scope,
+    )
+    bpy.types.Scene.ll_isolate_active = bpy.props.BoolProperty(default=False)
+    bpy.types.Scene.ll_isolate_state = bpy.props.StringProperty(options={'HIDDEN'})
+    bpy.types.Scene.ll_sync_selection = bpy.props.BoolProperty(
+        name="Sync Selection",
+        description="Keep the list checkboxes and the viewport/outliner selection in sync both ways",
+        default=False,
+        update=update_sync_selection
+    )
+    bpy.types.Scene.ll_include_emitters = bpy.props.BoolProperty(
+        name="Emissive Meshes",
+        description="Also list meshes with an emissive material as light sources",
+        default=True,
+        update=update_include_emitters
+    )
+    bpy.types.Scene.ll_search_kind = bpy.props.EnumProperty(name="Search In", items=SEARCH_KIND_ITEMS)
+    bpy.types.Scene.ll_search_query = bpy.props.StringProperty(
+        name="Search",
+        description="Name to search for; results update while typing",
+        options={'TEXTEDIT_UPDATE'}
+    )
+    bpy.types.Scene.ll_matrix_mode = bpy.props.EnumProperty(
+        name="Matrix Columns",
+        items=[
+            ('COLLECTIONS', "Collections", "Columns are the collections of the Collections list"),
+            ('MESHES', "Meshes", "Columns are the meshes of the Meshes list"),
+        ],
+        update=mark_matrix_dirty,
+    )
+    bpy.types.Scene.ll_matrix_row_offset = bpy.props.IntProperty(min=0, default=0)
+    bpy.types.Scene.ll_matrix_col_offset = bpy.props.IntProperty(min=0, default=0)
+    bpy.types.Scene.ll_matrix_columns = bpy.props.IntProperty(
+        name="Matrix Width",
+        description="Number of receiver columns to display in the link matrix",
+        default=6,
+        min=1,
+        max=30
+    )
+    bpy.types.Scene.ll_journal_enabled = bpy.props.BoolProperty(
+        name="Journal",
+        description="Record every Link and Unlink in this file's link journal so it can be replayed later",
+        default=True
+    )
+    bpy.types.Scene.ll_journal_sidecar = bpy.props.BoolProperty(
+        name="Sidecar",
+        description="Also append journal entries to a .lljournal file next to the .blend file",
+        default=False
+    )
+    bpy.types.Scene.ll_gc_on_save = bpy.props.BoolProperty(
+        name="Clean Up on Save",
+        description="Remove orphaned light linking collections every time the file is saved",
+        default=False
+    )
+    for handler_list, handler in app_handlers:
+        getattr(bpy.app.handlers, handler_list).append(handler)
+    migrate_legacy_links()
+    migrate_linking_tags()
+    migrate_row_selection()
+    subscribe_name_changes()
     update_light_items(bpy.context.scene, bpy.context)
     update_mesh_items(bpy.context.scene, bpy.context)
     update_collection_items(bpy.context.scene, bpy.context)
 
 def unregister():
+    _scheduler.cancel_all()
+    if bpy.app.timers.is_registered(run_scheduled_jobs):
+        bpy.app.timers.unregister(run_scheduled_jobs)
+    if bpy.app.timers.is_registered(sync_selection_from_viewport):
+        bpy.app.timers.unregister(sync_selection_from_viewport)
+    if bpy.app.timers.is_registered(flush_redraw):
+        bpy.app.timers.unregister(flush_redraw)
+    _redraw.pending = False
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handler_list, handler in app_handlers:
+        handlers = getattr(bpy.app.handlers, handler_list)
+        if handler in handlers:
+            handlers.remove(handler)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.ll_light_items
     del bpy.types.Scene.ll_mesh_items
     del bpy.types.Scene.ll_collection_items
+    del bpy.types.Scene.ll_light_selection
+    del bpy.types.Scene.ll_mesh_selection
+    del bpy.types.Scene.ll_collection_selection
     del bpy.types.Scene.ll_light_index
     del bpy.types.Scene.ll_mesh_index
     del bpy.types.Scene.ll_collection_index
     del bpy.types.Scene.ll_list_rows
+    del bpy.types.Scene.ll_light_groups
+    del bpy.types.Scene.ll_light_group_index
+    del bpy.types.Scene.ll_link_target
+    del bpy.types.Scene.ll_include_children
+    del bpy.types.Scene.ll_scope
+    del bpy.types.Scene.ll_isolate_active
+    del bpy.types.Scene.ll_isolate_state
+    del bpy.types.Scene.ll_sync_selection
+    del bpy.types.Scene.ll_include_emitters
+    del bpy.types.Scene.ll_search_kind
+    del bpy.types.Scene.ll_search_query
+    del bpy.types.Scene.ll_matrix_mode
+    del bpy.types.Scene.ll_matrix_row_offset
+    del bpy.types.Scene.ll_matrix_col_offset
+    del bpy.types.Scene.ll_matrix_columns
+    del bpy.types.Scene.ll_gc_on_save
+    del bpy.types.Scene.ll_journal_enabled
+    del bpy.types.Scene.ll_journal_sidecar
+    del bpy.types.Scene.ll_linking_tags_migrated
+    del bpy.types.Scene.ll_snapshot_on_save
+    del bpy.types.Collection.ll_linking_group
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
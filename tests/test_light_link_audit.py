@@ -0,0 +1,181 @@
+"""Checks for light_link_audit against small synthetic .blend files.
+
+The files are built from a minimal SDNA catalogue holding only the structs
+the audit reads, laid out the way Blender writes them.
+"""
+import gzip
+import os
+import re
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from light_link_audit import BlendFormatError, audit_file, find_issues, read_light_links
+
+OB_LAMP = 10
+OB_MESH = 1
+
+STRUCTS = [
+    ("ID", [("char", "name[66]"), ("char", "_pad[6]"), ("IDProperty", "*properties")]),
+    ("ListBase", [("void", "*first"), ("void", "*last")]),
+    ("Object", [("ID", "id"), ("short", "type"), ("short", "_pad[3]"), ("LightLinking", "*light_linking")]),
+    ("LightLinking", [("Collection", "*receiver_collection"), ("Collection", "*blocker_collection")]),
+    ("Collection", [("ID", "id"), ("ListBase", "gobject"), ("ListBase", "children")]),
+    ("CollectionObject", [("CollectionObject", "*next"), ("CollectionObject", "*prev"), ("Object", "*ob")]),
+    ("CollectionChild", [("CollectionChild", "*next"), ("CollectionChild", "*prev"), ("Collection", "*collection")]),
+    ("IDPropertyData", [("void", "*pointer"), ("ListBase", "group"), ("int", "val"), ("int", "val2")]),
+    ("IDProperty", [
+        ("IDProperty", "*next"), ("IDProperty", "*prev"), ("char", "type"), ("char", "subtype"),
+        ("short", "flag"), ("char", "name[64]"), ("int", "_pad0"), ("IDPropertyData", "data"),
+        ("int", "len"), ("int", "totallen"),
+    ]),
+]
+BASIC_SIZES = {"char": 1, "short": 2, "int": 4, "void": 0}
+
+
+def pad4(raw):
+    return raw + b"\0" * (-len(raw) % 4)
+
+
+def build_sdna():
+    types = list(BASIC_SIZES) + [name for name, _ in STRUCTS]
+    sizes = dict(BASIC_SIZES)
+    names = []
+    for struct_name, fields in STRUCTS:
+        total = 0
+        for field_type, field_name in fields:
+            size = 8 if "*" in field_name else sizes[field_type]
+            for dim in re.findall(r"\[(\d+)\]", field_name):
+                size *= int(dim)
+            total += size
+            if field_name not in names:
+                names.append(field_name)
+        sizes[struct_name] = total
+    dna = b"SDNA" + b"NAME" + struct.pack("<i", len(names))
+    dna += pad4(b"".join(name.encode() + b"\0" for name in names))
+    dna += b"TYPE" + struct.pack("<i", len(types)) + pad4(b"".join(t.encode() + b"\0" for t in types))
+    dna += b"TLEN" + pad4(b"".join(struct.pack("<H", sizes[t]) for t in types))
+    dna += b"STRC" + struct.pack("<i", len(STRUCTS))
+    for struct_name, fields in STRUCTS:
+        dna += struct.pack("<hh", types.index(struct_name), len(fields))
+        for field_type, field_name in fields:
+            dna += struct.pack("<hh", types.index(field_type), names.index(field_name))
+    return dna
+
+
+class BlendWriter:
+    """objects: name -> (type, receiver, blocker); collections: name -> (objects, children);
+    library_collections: names only present as linked-ID placeholders."""
+
+    def __init__(self, wide=False):
+        self.wide = wide
+        self.blocks = []
+        self.next_address = 0x1000
+
+    def address(self):
+        self.next_address += 0x100
+        return self.next_address
+
+    def block(self, code, payload, old):
+        if self.wide:
+            head = struct.pack("<4siQqq", code, 0, old, len(payload), 1)
+        else:
+            head = struct.pack("<4siQii", code, len(payload), old, 0, 1)
+        self.blocks.append(head + payload)
+
+    def write(self, path, objects, collections, library_collections=(), compress=False):
+        pointer = lambda value: struct.pack("<Q", value)
+        id_struct = lambda code, name: (code + name).encode().ljust(66, b"\0") + b"\0" * 6 + pointer(0)
+        colls = {name: self.address() for name in list(collections) + list(library_collections)}
+        obs = {name: self.address() for name in objects}
+
+        # Mesh data the audit has to step over without reading.
+        self.block(b"ME\0\0", b"\0" * 16, self.address())
+        self.block(b"DATA", b"\xff" * 512, self.address())
+        for name, (ob_type, receiver, blocker) in objects.items():
+            linking = self.address() if receiver or blocker else 0
+            self.block(b"OB\0\0", id_struct("OB", name) + struct.pack("<h", ob_type) + b"\0" * 6 + pointer(linking), obs[name])
+            if linking:
+                self.block(b"DATA", pointer(colls.get(receiver, 0)) + pointer(colls.get(blocker, 0)), linking)
+        for name, (members, children) in collections.items():
+            member_items = [self.address() for _ in members]
+            child_items = [self.address() for _ in children]
+            listbase = lambda items: pointer(items[0] if items else 0) + pointer(items[-1] if items else 0)
+            self.block(b"GR\0\0", id_struct("GR", name) + listbase(member_items) + listbase(child_items), colls[name])
+            for items, targets in ((member_items, [obs[m] for m in members]), (child_items, [colls[c] for c in children])):
+                for i, item in enumerate(items):
+                    next_item = items[i + 1] if i + 1 < len(items) else 0
+                    prev_item = items[i - 1] if i else 0
+                    self.block(b"DATA", pointer(next_item) + pointer(prev_item) + pointer(targets[i]), item)
+        for name in library_collections:
+            self.block(b"ID\0\0", id_struct("GR", name), colls[name])
+        self.block(b"DNA1", build_sdna(), 0)
+        self.block(b"ENDB", b"", 0)
+
+        header = b"BLENDER17-01v0500" if self.wide else b"BLENDER-v405"
+        raw = header + b"".join(self.blocks)
+        with open(path, "wb") as f:
+            f.write(gzip.compress(raw) if compress else raw)
+        return path
+
+
+SCENE_OBJECTS = {
+    "Key": (OB_LAMP, "Light Linking for Key", None),
+    "Fill": (OB_LAMP, "Light Linking for Fill", None),
+    "Rim": (OB_LAMP, None, None),
+    "Practical": (OB_LAMP, "Set Receivers", None),
+    "Hero": (OB_MESH, None, None),
+    "Prop": (OB_MESH, None, None),
+}
+SCENE_COLLECTIONS = {
+    "Light Linking for Key": (["Hero"], ["Props"]),
+    "Props": (["Prop"], []),
+    "Light Linking for Fill": ([], []),
+    "Light Linking for Old": (["Hero"], []),
+}
+
+
+@pytest.fixture(params=[False, True], ids=["legacy-header", "wide-header"])
+def scene_file(request, tmp_path):
+    writer = BlendWriter(wide=request.param)
+    return writer.write(str(tmp_path / "scene.blend"), SCENE_OBJECTS, SCENE_COLLECTIONS, ["Set Receivers"])
+
+
+def test_reads_nested_receivers(scene_file):
+    lights = read_light_links(scene_file)["lights"]
+    assert lights["Key"]["receivers"] == ["Hero", "Prop"]
+    assert lights["Key"]["receiver_collection"] == "Light Linking for Key"
+    assert lights["Rim"]["receiver_collection"] is None
+    assert "Hero" not in lights
+
+
+def test_library_collections_are_not_reported_empty(scene_file):
+    result = read_light_links(scene_file)
+    practical = result["lights"]["Practical"]
+    assert practical["receiver_collection"] == "Set Receivers"
+    assert practical["library_collections"] == ["Set Receivers"]
+    issues = find_issues(result)
+    assert not any("Practical" in issue for issue in issues)
+    assert "'Fill' links to empty receiver collection 'Light Linking for Fill'" in issues
+    assert "orphan linking collection 'Light Linking for Old'" in issues
+
+
+def test_audit_file_lists_library_links(scene_file):
+    result = audit_file(scene_file)
+    assert result["library_links"] == ["'Practical' links to 'Set Receivers' (linked from library, members not checked)"]
+
+
+def test_gzip_compressed_file(tmp_path):
+    path = BlendWriter().write(str(tmp_path / "packed.blend"), SCENE_OBJECTS, SCENE_COLLECTIONS, compress=True)
+    assert read_light_links(path)["lights"]["Key"]["receivers"] == ["Hero", "Prop"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.blend"
+    path.write_bytes(b"not a blend file")
+    with pytest.raises(BlendFormatError):
+        read_light_links(str(path))
+    assert "error" in audit_file(str(path))
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Checks for light_link_diff: the topology diff, snapshot loading and
+comparing a .blend file against a snapshot of the same links."""
+import base64
+import json
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from light_link_diff import (
+    LIBRARY_LIGHT,
+    LIBRARY_RECEIVERS,
+    SNAPSHOT_VERSION,
+    diff_topologies,
+    load_blend,
+    load_snapshot,
+    load_topology,
+    main,
+)
+from test_light_link_audit import SCENE_COLLECTIONS, SCENE_OBJECTS, BlendWriter
+
+
+def entry(receivers=(), blockers=(), receiver_collection="", blocker_collection="", library=0):
+    return (frozenset(receivers), frozenset(blockers), receiver_collection, blocker_collection, library)
+
+
+def write_snapshot(path, topology, version=SNAPSHOT_VERSION):
+    # Same layout as the add-on's encode_link_snapshot.
+    names = {}
+    ref = lambda name: names.setdefault(name, len(names))
+    rows = [
+        [ref(light), [ref(n) for n in sorted(e[0])], [ref(n) for n in sorted(e[1])], ref(e[2]), ref(e[3]), e[4]]
+        for light, e in topology.items()
+    ]
+    payload = {"version": version, "fingerprint": "", "names": list(names), "rows": rows}
+    with open(path, "w", encoding="ascii") as f:
+        f.write(base64.b85encode(zlib.compress(json.dumps(payload).encode())).decode("ascii"))
+    return str(path)
+
+
+def test_diff_reports_added_removed_and_changed():
+    old = {
+        "Key": entry(["Hero", "Prop"], receiver_collection="LL Key"),
+        "Fill": entry(["Hero"], receiver_collection="LL Fill"),
+        "Rim": entry(["Hero"], receiver_collection="LL Rim"),
+    }
+    new = {
+        "Key": entry(["Hero", "Tree"], receiver_collection="LL Key"),
+        "Fill": entry(["Hero"], receiver_collection="LL Fill"),
+        "Bounce": entry(["Prop"], receiver_collection="LL Bounce"),
+    }
+    diff = diff_topologies(old, new)
+    assert list(diff["added"]) == ["Bounce"]
+    assert list(diff["removed"]) == ["Rim"]
+    assert diff["changed"] == {"Key": {"receivers": {"added": ["Tree"], "removed": ["Prop"]}}}
+    assert diff["unchanged"] == 1
+
+
+def test_library_parts_are_not_compared():
+    old = {
+        "Set Lamp": entry(["Hero"], receiver_collection="LL Lamp", library=LIBRARY_LIGHT),
+        "Practical": entry(["Hero", "Prop"], receiver_collection="Set Receivers", library=LIBRARY_RECEIVERS),
+    }
+    new = {"Practical": entry([], receiver_collection="Set Receivers", library=LIBRARY_RECEIVERS)}
+    diff = diff_topologies(old, new)
+    assert diff["not_compared"] == ["Set Lamp"]
+    assert not diff["removed"] and not diff["changed"]
+
+
+def test_snapshot_round_trip(tmp_path):
+    topology = {"Key": entry(["Hero"], ["Prop"], "LL Key", "LL Key Block")}
+    assert load_snapshot(write_snapshot(tmp_path / "a.llsnap", topology)) == topology
+
+
+def test_old_snapshot_version_is_rejected(tmp_path):
+    path = write_snapshot(tmp_path / "old.llsnap", {"Key": entry(["Hero"], receiver_collection="LL Key")}, version=3)
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_blend_matches_its_own_snapshot(tmp_path):
+    blend = BlendWriter().write(str(tmp_path / "scene.blend"), SCENE_OBJECTS, SCENE_COLLECTIONS, ["Set Receivers"])
+    # What the add-on saves for the same file: nested receivers, library collection expanded.
+    snapshot = write_snapshot(tmp_path / "scene.llsnap", {
+        "Key": entry(["Hero", "Prop"], receiver_collection="Light Linking for Key"),
+        "Fill": entry([], receiver_collection="Light Linking for Fill"),
+        "Practical": entry(["Set Chair"], receiver_collection="Set Receivers", library=LIBRARY_RECEIVERS),
+        "Set Lamp": entry(["Set Chair"], receiver_collection="Set Receivers", library=LIBRARY_LIGHT | LIBRARY_RECEIVERS),
+    })
+    assert set(load_blend(blend)) == {"Key", "Fill", "Practical"}
+    diff = diff_topologies(load_topology(blend), load_topology(snapshot))
+    assert not diff["added"] and not diff["removed"] and not diff["changed"]
+    assert diff["not_compared"] == ["Set Lamp"]
+    assert main([blend, snapshot]) == 0
\ No newline at end of file